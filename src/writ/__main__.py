@@ -1,14 +1,15 @@
 """Entry point for python -m writ."""
 
-import argparse
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from writ.app import ReplApp
-from writ.cli import run_config, run_init
-from writ.config import WRIT_HOME, ReplSettings, load_settings
+from writ.config import WRIT_HOME_EXPANDED, ReplSettings, load_settings
 from writ.exceptions import ConfigError
 
+if TYPE_CHECKING:
+    import argparse
+
 
 def resolve_paths(
     config_path: str = "./config",
@@ -18,8 +19,10 @@ def resolve_paths(
     return Path(config_path).expanduser(), Path(workflows_path).expanduser()
 
 
-def _build_parser() -> argparse.ArgumentParser:
+def _build_parser() -> "argparse.ArgumentParser":
     """Build the CLI argument parser."""
+    import argparse
+
     parser = argparse.ArgumentParser(prog="writ", description="auto-writ CLI")
     subparsers = parser.add_subparsers(dest="command")
 
@@ -43,7 +46,7 @@ def _build_parser() -> argparse.ArgumentParser:
 
 def _load_repl_settings() -> ReplSettings:
     """Load settings from ~/.auto-writ or fall back to defaults."""
-    home_settings = WRIT_HOME.expanduser() / "settings.yaml"
+    home_settings = WRIT_HOME_EXPANDED / "settings.yaml"
     local_settings = Path("./config/settings.yaml")
 
     for path in (home_settings, local_settings):
@@ -53,32 +56,17 @@ def _load_repl_settings() -> ReplSettings:
     return ReplSettings()
 
 
-def main() -> int:
-    """Run the CLI or REPL."""
-    parser = _build_parser()
-    args = parser.parse_args()
-
-    if args.command == "init":
-        run_init()
-        return 0
-
-    if args.command == "config":
-        try:
-            settings = _load_repl_settings()
-        except ConfigError as e:
-            print(f"Config error: {e}", file=sys.stderr)
-            return 1
-        editor = args.editor or settings.editor
-        run_config(editor=editor, target=args.target)
-        return 0
-
-    # No subcommand — start REPL
+def _run_repl() -> int:
+    """Load settings and start the REPL."""
     try:
         settings = _load_repl_settings()
     except ConfigError as e:
         print(f"Config error: {e}", file=sys.stderr)
         return 1
 
+    # prompt_toolkit and the pipeline stack are only needed by the REPL
+    from writ.app import ReplApp
+
     config_dir, workflows_dir = resolve_paths(
         config_path=settings.config_path,
         workflows_path=settings.workflows_path,
@@ -92,5 +80,42 @@ def main() -> int:
     return app.run()
 
 
+def main() -> int:
+    """Run the CLI or REPL."""
+    argv = sys.argv[1:]
+
+    # Fast paths: the bare REPL launch and a plain `init` need no argparse
+    if not argv:
+        return _run_repl()
+
+    if argv == ["init"]:
+        from writ.cli import run_init
+
+        run_init()
+        return 0
+
+    args = _build_parser().parse_args(argv)
+
+    if args.command == "init":
+        from writ.cli import run_init
+
+        run_init()
+        return 0
+
+    if args.command == "config":
+        try:
+            settings = _load_repl_settings()
+        except ConfigError as e:
+            print(f"Config error: {e}", file=sys.stderr)
+            return 1
+        from writ.cli import run_config
+
+        editor = args.editor or settings.editor
+        run_config(editor=editor, target=args.target)
+        return 0
+
+    return _run_repl()
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,121 @@
+"""Read fork log metadata and stream log contents without loading whole files."""
+
+import codecs
+import io
+import os
+import sys
+
+# Fork logs carry their metadata in a short header and trailer
+LOG_HEAD_BYTES = 4096
+LOG_TAIL_BYTES = 512
+LOG_CHUNK_BYTES = 65536
+LOG_HEADER_PREFIXES = ((b"--- FORK: ", "name"), (b"Started: ", "started"))
+LOG_TRAILER_PREFIXES = ((b"Exit code: ", "exit"),)
+LOG_TRAILER_MARKERS = (b"\n---\nFinished:", b"\n---\nExit code:")
+# 'logs tail' starts this many lines from the end, like tail -n
+LOG_TAIL_LINES = 100
+LOG_SEEK_BLOCK = 8192
+
+
+def scan_fields(
+    chunk: bytes,
+    prefixes: tuple[tuple[bytes, str], ...],
+    fields: dict[str, str],
+    from_end: bool = False,
+) -> None:
+    """Fill fields from lines that start with a known prefix.
+
+    Each prefix is matched at most once and the scan stops as soon as every
+    field has been found. With from_end, lines are scanned last to first so
+    the final occurrence of a prefix wins.
+    """
+    pending = [(prefix, key) for prefix, key in prefixes if key not in fields]
+    lines = chunk.splitlines()
+    for line in reversed(lines) if from_end else lines:
+        if not pending:
+            return
+        for i, (prefix, key) in enumerate(pending):
+            if line.startswith(prefix):
+                fields[key] = line[len(prefix) :].decode(errors="replace")
+                del pending[i]
+                break
+
+
+def read_meta(path: str) -> tuple[str, str, str]:
+    """Read name, start time and status from a fork log's header and trailer.
+
+    Only the first LOG_HEAD_BYTES and last LOG_TAIL_BYTES are read, so large
+    logs cost the same as small ones.
+    """
+    fields: dict[str, str] = {}
+    with open(path, "rb") as f:
+        head = f.read(LOG_HEAD_BYTES)
+        scan_fields(head, LOG_HEADER_PREFIXES, fields)
+        if len(head) < LOG_HEAD_BYTES:
+            # The whole log fit in the first read; take the trailer from it
+            tail = head[-LOG_TAIL_BYTES:]
+        else:
+            size = os.fstat(f.fileno()).st_size
+            f.seek(max(0, size - LOG_TAIL_BYTES))
+            tail = f.read()
+        # The trailer comes last; script output in the tail may repeat its prefixes
+        scan_fields(tail, LOG_TRAILER_PREFIXES, fields, from_end=True)
+
+    name = fields["name"].rstrip(" -") if "name" in fields else "unknown"
+    status = f"exit {fields['exit']}" if "exit" in fields else "running"
+    return name, fields.get("started", "?"), status
+
+
+def tail_offset(fd: int, lines: int, block: int = LOG_SEEK_BLOCK) -> int:
+    """Return the offset where the last `lines` lines of an open file begin.
+
+    Reads backwards from the end in block-sized pieces, so only the tail of
+    the file is touched. A newline ending the file does not count as a line.
+    """
+    end = os.fstat(fd).st_size
+    pos = end
+    seen = 0
+    while pos > 0:
+        start = max(0, pos - block)
+        chunk = os.pread(fd, pos - start, start)
+        stop = len(chunk)
+        if pos == end and chunk.endswith(b"\n"):
+            stop -= 1
+        while (stop := chunk.rfind(b"\n", 0, stop)) != -1:
+            seen += 1
+            if seen == lines:
+                return start + stop + 1
+        pos = start
+    return 0
+
+
+class LogStream:
+    """Copies a log file to stdout through one reused buffer, watching for the trailer."""
+
+    _KEEP = max(len(m) for m in LOG_TRAILER_MARKERS) - 1
+
+    def __init__(self, f: io.RawIOBase, chunk_size: int = LOG_CHUNK_BYTES) -> None:
+        self._f = f
+        self._buf = bytearray(chunk_size)
+        self._view = memoryview(self._buf)
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._carry = b""
+        self.finished = False
+
+    def drain(self) -> bool:
+        """Print everything up to EOF. Return True if anything was read."""
+        read_any = False
+        while n := self._f.readinto(self._buf):
+            read_any = True
+            sys.stdout.write(self._decoder.decode(self._view[:n]))
+            if not self.finished:
+                self._scan(n)
+        if read_any:
+            sys.stdout.flush()
+        return read_any
+
+    def _scan(self, n: int) -> None:
+        """Look for the trailer in the new bytes, including across chunk edges."""
+        head = self._carry + self._view[: min(n, self._KEEP)]
+        self.finished = any(self._buf.find(m, 0, n) != -1 or m in head for m in LOG_TRAILER_MARKERS)
+        self._carry = (self._carry + self._view[max(0, n - self._KEEP) : n])[-self._KEEP :]
@@ -0,0 +1,49 @@
+"""Parse YAML files, reusing results for files that have not changed."""
+
+import copy
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+try:
+    # libyaml-backed parser; same safe semantics, parses in C
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader  # type: ignore[assignment]
+
+MAX_ENTRIES = 256
+
+_CACHE: OrderedDict[Path, tuple[tuple[int, int], Any]] = OrderedDict()
+
+
+def parse_yaml(data: bytes | str) -> Any:
+    """Parse a YAML document with the fastest available safe loader."""
+    return yaml.load(data, Loader=SafeLoader)
+
+
+def load_cached(path: Path) -> Any:
+    """Parse a YAML file, reusing the last result while its mtime and size match.
+
+    Callers get a deep copy, so mutating the result never leaks into the cache.
+    Raises OSError if the file cannot be read and yaml.YAMLError if it does not parse.
+    """
+    st = path.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    entry = _CACHE.get(path)
+    if entry is not None and entry[0] == key:
+        _CACHE.move_to_end(path)
+        return copy.deepcopy(entry[1])
+
+    data = parse_yaml(path.read_bytes())
+    _CACHE[path] = (key, data)
+    _CACHE.move_to_end(path)
+    if len(_CACHE) > MAX_ENTRIES:
+        _CACHE.popitem(last=False)
+    return copy.deepcopy(data)
+
+
+def clear_cache() -> None:
+    """Drop every cached document."""
+    _CACHE.clear()
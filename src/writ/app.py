@@ -1,17 +1,17 @@
 """REPL loop with prompt_toolkit integration."""
 
-import time
+import os
+import sys
+from collections.abc import Callable
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from prompt_toolkit import PromptSession
-from prompt_toolkit.completion import WordCompleter
-from prompt_toolkit.history import FileHistory
-
+from writ._logutil import LOG_TAIL_LINES, LogStream, read_meta, tail_offset
 from writ.cli import run_config, run_init
 from writ.commands import CommandRegistry
 from writ.config import (
     LOGS_DIR,
-    WRIT_HOME,
+    WRIT_HOME_EXPANDED,
     CommandsConfig,
     ReplSettings,
     load_commands_config,
@@ -19,23 +19,32 @@ from writ.config import (
 from writ.exceptions import CommandNotFoundError, PipelineError, ReplError
 from writ.executor import Executor
 from writ.output import OutputBuffer
-from writ.pipeline import PipelineLoader, PipelineRunner
 from writ.variables import SecretStore, VariableResolver
-
-BUILTINS = {
-    "help",
-    "commands",
-    "pipeline",
-    "last",
-    "history",
-    "vars",
-    "reload",
-    "mode",
-    "init",
-    "config",
-    "exit",
-    "quit",
-}
+from writ.watcher import FileWatcher
+
+if TYPE_CHECKING:
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.completion import WordCompleter
+
+    from writ.pipeline import PipelineInfo, PipelineLoader
+
+BUILTINS = frozenset(
+    {
+        "help",
+        "commands",
+        "pipeline",
+        "last",
+        "history",
+        "vars",
+        "reload",
+        "mode",
+        "init",
+        "config",
+        "exit",
+        "quit",
+    }
+)
+SORTED_BUILTINS: tuple[str, ...] = tuple(sorted(BUILTINS))
 
 
 def parse_input(text: str) -> tuple[str, str]:
@@ -45,10 +54,31 @@ def parse_input(text: str) -> tuple[str, str]:
         return "", ""
     if text.startswith("!"):
         return "!", text[1:].strip()
-    parts = text.split(None, 1)
-    cmd = parts[0]
-    args = parts[1].strip() if len(parts) > 1 else ""
-    return cmd, args
+    return _split_word(text)
+
+
+def _split_word(text: str) -> tuple[str, str]:
+    """Split stripped text into its first word and the stripped remainder."""
+    head, _, rest = text.partition(" ")
+    if not head.isprintable():
+        # Separated by a tab, newline or other non-space whitespace: split like str.split()
+        parts = text.split(None, 1)
+        return parts[0], parts[1].strip() if len(parts) > 1 else ""
+    return head, rest.strip()
+
+
+def _file_stamp(path: Path) -> tuple[int, int] | None:
+    """Return (mtime_ns, size) for path, or None if it cannot be stat'ed."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _write_lines(lines: list[str]) -> None:
+    """Write a block of lines to stdout in a single call."""
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 class ReplApp:
@@ -65,6 +95,12 @@ class ReplApp:
         self._workflows_dir = workflows_dir
         self._registry = CommandRegistry({})
         self._commands_config = CommandsConfig(variables={}, commands={})
+        self._resolver: VariableResolver | None = None
+        self._commands_yaml_stamp: tuple[int, int] | None = None
+        self._dotenv_stamp: tuple[int, int] | None = None
+        # Set by run(); outside the REPL loop confirmations fall back to input()
+        self._confirm_session: PromptSession[str] | None = None
+        self._completer: WordCompleter | None = None
         self._secrets = SecretStore()
         self._output_buffer = OutputBuffer(max_size=settings.buffer_size)
         self._executor = Executor(
@@ -72,8 +108,48 @@ class ReplApp:
             secrets=self._secrets,
             stream_output=settings.stream,
         )
-        self._pipeline_loader = PipelineLoader(workflows_dir)
-        self._logs_dir = WRIT_HOME.expanduser() / LOGS_DIR
+        self._loader: PipelineLoader | None = None
+        self._pipeline_cache: list[PipelineInfo] | None = None
+        self._pipeline_cache_mtime = -1
+        self._logs_dir = WRIT_HOME_EXPANDED / LOGS_DIR
+
+    @property
+    def _pipeline_loader(self) -> "PipelineLoader":
+        """Pipeline loader for the workflows directory, built on first use."""
+        if self._loader is None:
+            from writ.pipeline import PipelineLoader
+
+            self._loader = PipelineLoader(self._workflows_dir)
+        return self._loader
+
+    @_pipeline_loader.setter
+    def _pipeline_loader(self, loader: "PipelineLoader") -> None:
+        self._loader = loader
+        self._pipeline_cache = None
+
+    def _discover_cached(self) -> list["PipelineInfo"]:
+        """Return discovered pipelines, rescanning only when the directory changes.
+
+        Keyed on the workflows directory mtime, so adding, removing or renaming
+        a file triggers a rescan. Edits inside an existing file are picked up
+        on ``reload``.
+        """
+        loader = self._pipeline_loader
+        try:
+            mtime = loader.workflows_dir.stat().st_mtime_ns
+        except OSError:
+            # Directory is gone; rescan so the loader's name index empties too
+            self._pipeline_cache = None
+            return loader.discover()
+        if self._pipeline_cache is None or mtime != self._pipeline_cache_mtime:
+            self._pipeline_cache = loader.discover()
+            self._pipeline_cache_mtime = mtime
+        return self._pipeline_cache
+
+    def _find_pipeline(self, name: str) -> "PipelineInfo | None":
+        """Look up a discovered pipeline by name."""
+        self._discover_cached()
+        return self._pipeline_loader.get(name)
 
     def is_builtin(self, cmd: str) -> bool:
         """Check if a command is a built-in."""
@@ -85,46 +161,61 @@ class ReplApp:
 
     def get_completions(self) -> list[str]:
         """Get all completable words for the prompt."""
-        words = list(BUILTINS)
-        words.extend(self._registry.list_names())
-        for cmd in self._registry._commands.values():
-            words.extend(cmd.aliases)
-        return sorted(set(words))
+        configured = self._registry.all_names_and_aliases
+        return [*SORTED_BUILTINS, *(w for w in configured if w not in BUILTINS)]
 
     def load_config(self) -> None:
         """Load or reload configuration."""
         commands_path = self._config_dir / "commands.yaml"
-        if commands_path.exists():
+        stamp = _file_stamp(commands_path)
+        if stamp is not None and stamp != self._commands_yaml_stamp:
             self._commands_config = load_commands_config(commands_path)
             self._registry = CommandRegistry(self._commands_config.commands)
+            self._commands_yaml_stamp = stamp
+            self._resolver = None
 
         # Load secrets
         if "dotenv" in self._settings.secret_sources:
             dotenv_path = Path(self._settings.dotenv_path).expanduser()
-            self._secrets.load_dotenv(dotenv_path)
+            stamp = _file_stamp(dotenv_path)
+            if stamp is not None and stamp != self._dotenv_stamp:
+                self._secrets.load_dotenv(dotenv_path)
+                self._dotenv_stamp = stamp
 
     def _make_resolver(self, pipeline_vars: dict[str, str] | None = None) -> VariableResolver:
-        """Create a variable resolver with current state."""
-        return VariableResolver(
+        """Create a variable resolver with current state.
+
+        Without pipeline variables the resolver is shared until commands.yaml
+        is reloaded, so its memoized templates carry across commands.
+        """
+        if pipeline_vars is None and self._resolver is not None:
+            return self._resolver
+        resolver = VariableResolver(
             config_vars=self._commands_config.variables,
             pipeline_vars=pipeline_vars,
             secrets=self._secrets,
         )
+        if pipeline_vars is None:
+            self._resolver = resolver
+        return resolver
 
-    def _handle_commands(self) -> None:
+    def _handle_commands(self, _args: str = "") -> None:
         """List configured commands from commands.yaml."""
         names = self._registry.list_names()
         if not names:
             print("No commands configured.")
             return
+        lines = []
         for name in names:
             cmd = self._registry.get(name)
             aliases = f" ({', '.join(cmd.aliases)})" if cmd.aliases else ""
             tags = f"  [{', '.join(cmd.tags)}]" if cmd.tags else ""
-            print(f"  {name}{aliases}{tags}  -- {cmd.description}")
+            lines.append(f"  {name}{aliases}{tags}  -- {cmd.description}")
+        _write_lines(lines)
 
     def _handle_help(self, args: str) -> None:
         """Handle the help command."""
+        lines: list[str] = []
         if args.startswith("--tag "):
             tag = args[6:].strip()
             commands = self._registry.filter_by_tag(tag)
@@ -133,49 +224,52 @@ class ReplApp:
                 return
             for cmd in commands:
                 aliases = f" ({', '.join(cmd.aliases)})" if cmd.aliases else ""
-                print(f"  {cmd.name}{aliases}  -- {cmd.description}")
+                lines.append(f"  {cmd.name}{aliases}  -- {cmd.description}")
         elif args:
             try:
                 cmd = self._registry.get(args)
-                print(f"  {cmd.name}: {cmd.description}")
-                print(f"  Command: {cmd.command}")
-                if cmd.aliases:
-                    print(f"  Aliases: {', '.join(cmd.aliases)}")
-                if cmd.tags:
-                    print(f"  Tags: {', '.join(cmd.tags)}")
-                if cmd.confirm:
-                    print("  Requires confirmation")
-                if cmd.timeout:
-                    print(f"  Timeout: {cmd.timeout}s")
             except CommandNotFoundError:
                 print(f"Unknown command: {args}")
+                return
+            lines.append(f"  {cmd.name}: {cmd.description}")
+            lines.append(f"  Command: {cmd.command}")
+            if cmd.aliases:
+                lines.append(f"  Aliases: {', '.join(cmd.aliases)}")
+            if cmd.tags:
+                lines.append(f"  Tags: {', '.join(cmd.tags)}")
+            if cmd.confirm:
+                lines.append("  Requires confirmation")
+            if cmd.timeout:
+                lines.append(f"  Timeout: {cmd.timeout}s")
         else:
-            print("Built-in commands:")
-            for name in sorted(BUILTINS):
-                print(f"  {name}")
-            print("\nConfigured commands:")
+            lines.append("Built-in commands:")
+            lines.extend(f"  {name}" for name in SORTED_BUILTINS)
+            lines.append("\nConfigured commands:")
             for name in self._registry.list_names():
                 cmd = self._registry.get(name)
                 aliases = f" ({', '.join(cmd.aliases)})" if cmd.aliases else ""
-                print(f"  {name}{aliases}  -- {cmd.description}")
+                lines.append(f"  {name}{aliases}  -- {cmd.description}")
             tags = self._registry.all_tags()
             if tags:
-                print(f"\nTags: {', '.join(tags)}")
-                print("Use 'help --tag <tag>' to filter")
+                lines.append(f"\nTags: {', '.join(tags)}")
+                lines.append("Use 'help --tag <tag>' to filter")
+        _write_lines(lines)
 
     def _handle_pipeline(self, args: str) -> None:
         """Handle pipeline subcommands."""
-        parts = args.split(None, 1)
-        subcmd = parts[0] if parts else ""
-        subargs = parts[1].strip() if len(parts) > 1 else ""
+        subcmd, subargs = _split_word(args.strip())
 
         if subcmd == "list":
-            pipelines = self._pipeline_loader.discover()
+            pipelines = self._discover_cached()
             if not pipelines:
                 print("No pipelines found.")
                 return
-            for p in pipelines:
-                print(f"  {p.name} [{p.pipeline_type}]  -- {p.description or p.title}")
+            _write_lines(
+                [
+                    f"  {p.name} [{p.pipeline_type}]  -- {p.description or p.title}"
+                    for p in pipelines
+                ]
+            )
 
         elif subcmd == "show":
             self._show_pipeline(subargs)
@@ -197,36 +291,36 @@ class ReplApp:
 
     def _show_pipeline(self, name: str) -> None:
         """Display pipeline steps without running."""
-        pipelines = self._pipeline_loader.discover()
-        match = next((p for p in pipelines if p.name == name), None)
+        match = self._find_pipeline(name)
         if not match:
             print(f"Pipeline not found: {name}")
             return
 
         if match.pipeline_type == "yaml":
             pipeline = self._pipeline_loader.load_yaml(match.path)
-            print(f"Pipeline: {pipeline.title}")
-            print(f"Description: {pipeline.description}")
+            lines = [f"Pipeline: {pipeline.title}", f"Description: {pipeline.description}"]
             if pipeline.variables:
-                print(f"Variables: {pipeline.variables}")
-            print("Steps:")
+                lines.append(f"Variables: {pipeline.variables}")
+            lines.append("Steps:")
             for i, step in enumerate(pipeline.steps, 1):
                 cmd = step.command or step.run or "?"
-                print(f"  {i}. {step.name}: {cmd} (on_failure={step.on_failure})")
+                lines.append(f"  {i}. {step.name}: {cmd} (on_failure={step.on_failure})")
                 if step.when:
-                    print(f"     when: {step.when}")
+                    lines.append(f"     when: {step.when}")
+            _write_lines(lines)
         else:
             print(f"Pipeline: {name} [{match.pipeline_type}]")
             print(f"Path: {match.path}")
 
     def _run_pipeline(self, name: str) -> None:
         """Execute a pipeline by name."""
-        pipelines = self._pipeline_loader.discover()
-        match = next((p for p in pipelines if p.name == name), None)
+        match = self._find_pipeline(name)
         if not match:
             print(f"Pipeline not found: {name}")
             return
 
+        from writ.pipeline import PipelineRunner
+
         resolver = self._make_resolver()
         runner = PipelineRunner(
             executor=self._executor,
@@ -265,8 +359,7 @@ class ReplApp:
             print("Usage: pipeline fork <name>")
             return
 
-        pipelines = self._pipeline_loader.discover()
-        match = next((p for p in pipelines if p.name == name), None)
+        match = self._find_pipeline(name)
         if not match:
             print(f"Pipeline not found: {name}")
             return
@@ -277,6 +370,8 @@ class ReplApp:
 
         self._logs_dir.mkdir(parents=True, exist_ok=True)
 
+        from writ.pipeline import PipelineRunner
+
         resolver = self._make_resolver()
         runner = PipelineRunner(
             executor=self._executor,
@@ -288,9 +383,7 @@ class ReplApp:
 
     def _handle_logs(self, args: str) -> None:
         """Handle pipeline logs subcommands."""
-        parts = args.split(None, 1)
-        subcmd = parts[0] if parts else ""
-        subargs = parts[1].strip() if len(parts) > 1 else ""
+        subcmd, subargs = _split_word(args.strip())
 
         if subcmd == "list":
             self._logs_list()
@@ -301,38 +394,41 @@ class ReplApp:
 
     def _logs_list(self) -> None:
         """List fork log files with metadata."""
-        if not self._logs_dir.exists():
-            print("No logs found.")
-            return
-
-        log_files = sorted(
-            self._logs_dir.glob("*.log"),
-            key=lambda p: p.stat().st_mtime,
-            reverse=True,
-        )
+        try:
+            with os.scandir(self._logs_dir) as it:
+                log_files = [
+                    (entry.stat().st_mtime, entry.path, entry.name[:-4])
+                    for entry in it
+                    if entry.name.endswith(".log")
+                ]
+        except FileNotFoundError:
+            log_files = []
         if not log_files:
             print("No logs found.")
             return
+        log_files.sort(reverse=True)
 
-        for log_path in log_files:
-            fork_id = log_path.stem
-            name = "unknown"
-            started = "?"
-            status = "running"
-
+        lines = []
+        for _, log_path, fork_id in log_files:
             try:
-                content = log_path.read_text()
-                for line in content.splitlines():
-                    if line.startswith("--- FORK: "):
-                        name = line[10:].rstrip(" -")
-                    elif line.startswith("Started: "):
-                        started = line[9:]
-                    elif line.startswith("Exit code: "):
-                        status = f"exit {line[11:]}"
+                name, started, status = read_meta(log_path)
             except OSError:
-                pass
+                name, started, status = "unknown", "?", "running"
+
+            lines.append(f"  {fork_id}  {name}  {started}  {status}")
+        _write_lines(lines)
 
-            print(f"  {fork_id}  {name}  {started}  {status}")
+    def _find_logs(self, id_prefix: str) -> list[str]:
+        """Return paths of fork logs whose id starts with id_prefix."""
+        try:
+            with os.scandir(self._logs_dir) as it:
+                return [
+                    entry.path
+                    for entry in it
+                    if entry.name.startswith(id_prefix) and entry.name.endswith(".log")
+                ]
+        except FileNotFoundError:
+            return []
 
     def _logs_tail(self, id_prefix: str) -> None:
         """Live-follow a fork log file. Ctrl+C to stop."""
@@ -340,11 +436,12 @@ class ReplApp:
             print("Usage: pipeline logs tail <id>")
             return
 
-        if not self._logs_dir.exists():
-            print(f"Log not found: {id_prefix}")
-            return
-
-        matches = [p for p in self._logs_dir.glob("*.log") if p.stem.startswith(id_prefix)]
+        # A full fork id names its log directly; only prefixes need a scan
+        exact = os.path.join(self._logs_dir, f"{id_prefix}.log")
+        if os.sep not in id_prefix and os.path.isfile(exact):
+            matches = [exact]
+        else:
+            matches = self._find_logs(id_prefix)
         if not matches:
             print(f"Log not found: {id_prefix}")
             return
@@ -354,33 +451,17 @@ class ReplApp:
 
         log_path = matches[0]
         try:
-            with open(log_path) as f:
-                # Print existing content
-                while True:
-                    line = f.readline()
-                    if not line:
-                        break
-                    print(line, end="")
-
-                # Check if process is done (trailer present)
-                content = log_path.read_text()
-                if "\n---\nFinished:" in content or "\n---\nExit code:" in content:
+            with open(log_path, "rb", buffering=0) as f, FileWatcher(log_path) as watcher:
+                f.seek(tail_offset(f.fileno(), LOG_TAIL_LINES))
+                stream = LogStream(f)
+                stream.drain()
+                if stream.finished:
                     return
 
-                # Live follow
                 print("\n(following -- Ctrl+C to stop)\n")
-                while True:
-                    line = f.readline()
-                    if line:
-                        print(line, end="", flush=True)
-                        # Check if trailer appeared
-                        if "Exit code:" in line:
-                            # Drain remaining lines
-                            for remaining in f:
-                                print(remaining, end="", flush=True)
-                            return
-                    else:
-                        time.sleep(0.2)
+                while not stream.finished:
+                    if not stream.drain():
+                        watcher.wait()
         except KeyboardInterrupt:
             print("\n")
 
@@ -404,14 +485,13 @@ class ReplApp:
         if result.stderr:
             print(result.stderr, end="")
 
-    def _handle_vars(self) -> None:
+    def _handle_vars(self, _args: str = "") -> None:
         """Show current variables."""
-        print("Config variables:")
-        for k, v in self._commands_config.variables.items():
-            print(f"  {k} = {v}")
-        print("\nSecrets:")
-        for k in sorted(self._secrets._secrets.keys()):
-            print(f"  {k} = ***")
+        lines = ["Config variables:"]
+        lines.extend(f"  {k} = {v}" for k, v in self._commands_config.variables.items())
+        lines.append("\nSecrets:")
+        lines.extend(f"  {k} = ***" for k in sorted(self._secrets._secrets.keys()))
+        _write_lines(lines)
 
     def _handle_mode(self, args: str) -> None:
         """Show or switch mode."""
@@ -424,7 +504,7 @@ class ReplApp:
         else:
             print("Usage: mode [strict|open]")
 
-    def _handle_init(self) -> None:
+    def _handle_init(self, _args: str = "") -> None:
         """Handle the init builtin."""
         run_init()
 
@@ -447,13 +527,16 @@ class ReplApp:
             return
 
         if cmd.confirm:
-            response = input(f"  Run '{cmd.name}'? [y/N] ")
+            ask = self._confirm_session.prompt if self._confirm_session else input
+            response = ask(f"  Run '{cmd.name}'? [y/N] ")
             if response.lower() != "y":
                 print("  Cancelled.")
                 return
 
-        resolver = self._make_resolver()
-        resolved = resolver.resolve(cmd.command)
+        if self._registry.needs_resolve(cmd.name):
+            resolved = self._make_resolver().resolve(cmd.command)
+        else:
+            resolved = cmd.command
         result = self._executor.run(resolved, env=cmd.env, timeout=cmd.timeout)
         self._output_buffer.add(result)
 
@@ -467,16 +550,82 @@ class ReplApp:
         if not result.succeeded:
             print(f"\nCommand failed (exit code {result.returncode})")
 
+    def _handle_history(self, _args: str = "") -> None:
+        """History lives in the prompt session; point at the arrow keys."""
+        print("(Use up/down arrows to browse history)")
+
+    def _handle_reload(self, _args: str = "") -> None:
+        """Reload config and forget discovered pipelines."""
+        self.load_config()
+        self._loader = None
+        self._pipeline_cache = None
+        if self._completer is not None:
+            # Update in place; the session and its history file stay open
+            self._completer.words = self.get_completions()
+        print("Config reloaded.")
+
+    # Builtin name -> handler(app, args); exit/quit and "!" are handled in _dispatch
+    _HANDLERS: dict[str, Callable[["ReplApp", str], None]] = {
+        "help": _handle_help,
+        "commands": _handle_commands,
+        "pipeline": _handle_pipeline,
+        "last": _handle_last,
+        "history": _handle_history,
+        "vars": _handle_vars,
+        "reload": _handle_reload,
+        "mode": _handle_mode,
+        "init": _handle_init,
+        "config": _handle_config,
+    }
+
+    def _dispatch(self, text: str) -> bool:
+        """Handle one line of input. Return False when the REPL should exit."""
+        cmd, args = parse_input(text)
+        if not cmd:
+            return True
+
+        if cmd in ("exit", "quit"):
+            print("Bye.")
+            return False
+
+        handler = self._HANDLERS.get(cmd)
+        if handler is not None:
+            handler(self, args)
+        elif cmd == "!":
+            if self.allow_shell_escape():
+                self._execute_shell(args)
+            else:
+                print("Shell escape disabled in strict mode.")
+                print("Available commands:")
+                for name in self._registry.list_names():
+                    print(f"  {name}")
+        elif self._registry.has(cmd):
+            self._execute_config_command(cmd)
+        elif self.allow_shell_escape():
+            # In open mode, try as raw shell
+            self._execute_shell(text)
+        else:
+            print(f"Unknown command: {cmd}")
+            print("Type 'help' for available commands.")
+        return True
+
     def run(self) -> int:
         """Run the REPL loop."""
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.completion import WordCompleter
+        from prompt_toolkit.history import FileHistory
+
         self.load_config()
 
-        history_path = Path(self._settings.history_file).expanduser()
+        history_path = self._settings.history_path
         history_path.parent.mkdir(parents=True, exist_ok=True)
+        self._completer = WordCompleter(self.get_completions(), ignore_case=True)
         session: PromptSession[str] = PromptSession(
             history=FileHistory(str(history_path)),
-            completer=WordCompleter(self.get_completions(), ignore_case=True),
+            completer=self._completer,
         )
+        # Separate in-memory session so answers stay out of the command history
+        self._confirm_session = PromptSession()
 
         print(f"writ ready (mode: {self._settings.mode}). Type 'help' for commands.\n")
 
@@ -489,53 +638,9 @@ class ReplApp:
                 print("\nBye.")
                 return 0
 
-            cmd, args = parse_input(text)
-            if not cmd:
-                continue
-
             try:
-                if cmd in ("exit", "quit"):
-                    print("Bye.")
+                if not self._dispatch(text):
                     return 0
-                elif cmd == "help":
-                    self._handle_help(args)
-                elif cmd == "commands":
-                    self._handle_commands()
-                elif cmd == "pipeline":
-                    self._handle_pipeline(args)
-                elif cmd == "last":
-                    self._handle_last(args)
-                elif cmd == "history":
-                    print("(Use up/down arrows to browse history)")
-                elif cmd == "vars":
-                    self._handle_vars()
-                elif cmd == "reload":
-                    self.load_config()
-                    self._pipeline_loader = PipelineLoader(self._workflows_dir)
-                    print("Config reloaded.")
-                elif cmd == "mode":
-                    self._handle_mode(args)
-                elif cmd == "init":
-                    self._handle_init()
-                elif cmd == "config":
-                    self._handle_config(args)
-                elif cmd == "!":
-                    if self.allow_shell_escape():
-                        self._execute_shell(args)
-                    else:
-                        print("Shell escape disabled in strict mode.")
-                        print("Available commands:")
-                        for name in self._registry.list_names():
-                            print(f"  {name}")
-                elif self._registry.has(cmd):
-                    self._execute_config_command(cmd)
-                else:
-                    if self.allow_shell_escape():
-                        # In open mode, try as raw shell
-                        self._execute_shell(text)
-                    else:
-                        print(f"Unknown command: {cmd}")
-                        print("Type 'help' for available commands.")
             except ReplError as e:
                 print(f"Error: {e}")
             except Exception as e:
@@ -2,7 +2,7 @@
 
 import subprocess
 
-from writ.config import LOGS_DIR, VALID_EDITORS, WORKFLOWS_DIR, WRIT_HOME
+from writ.config import LOGS_DIR, VALID_EDITORS, WORKFLOWS_DIR, WRIT_HOME_EXPANDED
 
 DEFAULT_SETTINGS_YAML = """\
 writ:
@@ -42,7 +42,7 @@ def run_init() -> None:
     Creates the directory and writes settings.yaml and commands.yaml
     if they don't already exist. Idempotent: never overwrites existing files.
     """
-    home = WRIT_HOME.expanduser()
+    home = WRIT_HOME_EXPANDED
     created_anything = False
 
     if not home.exists():
@@ -84,7 +84,7 @@ def run_config(editor: str, target: str = "settings") -> None:
         print(f"Unknown editor: {editor}. Must be one of {VALID_EDITORS}")
         return
 
-    home = WRIT_HOME.expanduser()
+    home = WRIT_HOME_EXPANDED
     if not home.exists():
         print(f"Config directory not found: {home}")
         print("Run 'writ init' first to create it.")
@@ -1,7 +1,10 @@
 """Command registry and resolution."""
 
+from collections.abc import Iterable, Sequence
+
 from writ.config import CommandConfig
 from writ.exceptions import CommandNotFoundError
+from writ.variables import VAR_PATTERN
 
 
 class CommandRegistry:
@@ -9,34 +12,59 @@ class CommandRegistry:
 
     def __init__(self, commands: dict[str, CommandConfig]) -> None:
         self._commands = commands
+        self._names: tuple[str, ...] = tuple(commands)
         self._alias_map: dict[str, str] = {}
         for name, cmd in commands.items():
             for alias in cmd.aliases:
                 self._alias_map[alias] = name
+        # Names and aliases in one map; a command name beats an alias of the same key
+        self._by_key: dict[str, CommandConfig] = {
+            **{alias: commands[name] for alias, name in self._alias_map.items()},
+            **commands,
+        }
+        self._tag_index: dict[str, list[CommandConfig]] = {}
+        for cmd in commands.values():
+            for tag in dict.fromkeys(cmd.tags):
+                self._tag_index.setdefault(tag, []).append(cmd)
+        self._all_tags: tuple[str, ...] = tuple(sorted(self._tag_index))
+        self._all_names_and_aliases = tuple(sorted({*commands, *self._alias_map}))
+        # Commands whose template references no ${VAR} can skip resolution
+        self._templated = frozenset(
+            name for name, cmd in commands.items() if VAR_PATTERN.search(cmd.command)
+        )
+
+    @property
+    def all_names_and_aliases(self) -> tuple[str, ...]:
+        """Sorted command names and aliases, computed once at construction."""
+        return self._all_names_and_aliases
 
     def get(self, name_or_alias: str) -> CommandConfig:
         """Get a command by name or alias."""
-        if name_or_alias in self._commands:
-            return self._commands[name_or_alias]
-        if name_or_alias in self._alias_map:
-            return self._commands[self._alias_map[name_or_alias]]
-        raise CommandNotFoundError(name_or_alias, available=self.list_names())
+        try:
+            return self._by_key[name_or_alias]
+        except KeyError:
+            raise CommandNotFoundError(name_or_alias, available=list(self._names)) from None
 
     def has(self, name_or_alias: str) -> bool:
         """Check if a command exists by name or alias."""
-        return name_or_alias in self._commands or name_or_alias in self._alias_map
+        return name_or_alias in self._by_key
+
+    def needs_resolve(self, name: str) -> bool:
+        """Whether the named command's template contains ${VAR} references."""
+        return name in self._templated
 
-    def list_names(self) -> list[str]:
-        """Return all command names."""
-        return list(self._commands.keys())
+    def list_names(self) -> Sequence[str]:
+        """Return all command names in config order."""
+        return self._names
+
+    def iter_aliases(self) -> Iterable[str]:
+        """Return all aliases without copying."""
+        return self._alias_map.keys()
 
     def filter_by_tag(self, tag: str) -> list[CommandConfig]:
         """Return commands matching a tag."""
-        return [cmd for cmd in self._commands.values() if tag in cmd.tags]
-
-    def all_tags(self) -> list[str]:
-        """Return all unique tags across commands."""
-        tags: set[str] = set()
-        for cmd in self._commands.values():
-            tags.update(cmd.tags)
-        return sorted(tags)
+        return list(self._tag_index.get(tag, ()))
+
+    def all_tags(self) -> Sequence[str]:
+        """Return all unique tags across commands, sorted once at construction."""
+        return self._all_tags
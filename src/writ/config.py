@@ -1,21 +1,24 @@
 """YAML config loading and validation."""
 
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+from writ._yaml_cache import load_cached
 from writ.exceptions import ConfigError
 
 WRIT_HOME = Path("~/.auto-writ")
+WRIT_HOME_EXPANDED = WRIT_HOME.expanduser()
 VALID_MODES = ("strict", "open")
 VALID_EDITORS = ("vim", "nano", "emacs", "code")
 LOGS_DIR = "logs"
 WORKFLOWS_DIR = "workflows"
 
 
-@dataclass
+@dataclass(slots=True)
 class CommandConfig:
     """Configuration for a single command."""
 
@@ -29,7 +32,7 @@ class CommandConfig:
     env: dict[str, str] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class CommandsConfig:
     """Top-level commands configuration."""
 
@@ -55,14 +58,18 @@ class ReplSettings:
     dotenv_path: str = ".env"
     mask_in_output: bool = True
 
+    @cached_property
+    def history_path(self) -> Path:
+        """history_file with ~ expanded, computed once."""
+        return Path(self.history_file).expanduser()
+
 
 def _load_yaml(path: Path) -> dict[str, Any]:
     """Load and parse a YAML file."""
-    if not path.exists():
-        raise ConfigError(f"Config file not found: {path}")
     try:
-        with open(path) as f:
-            data = yaml.safe_load(f)
+        data = load_cached(path)
+    except FileNotFoundError as e:
+        raise ConfigError(f"Config file not found: {path}") from e
     except yaml.YAMLError as e:
         raise ConfigError(f"Invalid YAML in {path}: {e}") from e
     if not isinstance(data, dict):
@@ -1,14 +1,68 @@
 """Shell command execution with streaming and capture."""
 
+import codecs
+import errno
 import os
+import selectors
+import shlex
+import shutil
 import subprocess
-import threading
+import sys
 import time
-from typing import IO
+from typing import TextIO
 
-from writ.output import ExecutionResult
+from writ.output import ExecutionResult, LazyExecutionResult
 from writ.variables import SecretStore
 
+READ_CHUNK_BYTES = 65536
+POLL_INTERVAL = 0.1
+DRAIN_TIMEOUT = 5.0
+
+# Only this shell is skipped for simple commands: 'sh -c' reads no startup files or aliases
+DIRECT_EXEC_SHELL = "/bin/sh"
+# Any of these means the shell has work to do: expansion, quoting, redirection, ...
+SHELL_META = frozenset("|&;<>()$`\\\"'*?[]{}~#!=%^\n")
+# Builtins that change shell state or behave differently from a same-named binary
+SHELL_BUILTINS = frozenset(
+    "alias bg cd command exec exit export fc fg getopts hash jobs kill read set source"
+    " time type ulimit umask unset wait whence where which".split()
+)
+
+
+def direct_argv(command: str, path: str | None = None) -> list[str] | None:
+    """Split a command into an argv that can be exec'd without a shell.
+
+    Returns None if the command uses any shell syntax, names a builtin, or its
+    program is not found on path, in which case it must go through the shell.
+    """
+    if not command or not SHELL_META.isdisjoint(command):
+        return None
+    argv = shlex.split(command)
+    if not argv or argv[0] in SHELL_BUILTINS:
+        return None
+    program = shutil.which(argv[0], path=path)
+    if program is None:
+        return None
+    argv[0] = program
+    return argv
+
+
+def _popen(argv: list[str], env: dict[str, str] | None) -> "subprocess.Popen[bytes]":
+    """Start argv with both output streams piped back to us."""
+    return subprocess.Popen(
+        argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env, bufsize=-1
+    )
+
+
+def _wait_until(proc: "subprocess.Popen[bytes]", deadline: float | None) -> int:
+    """Wait for proc to exit, killing it once deadline passes. Returns -9 if killed."""
+    remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+    try:
+        return proc.wait(remaining)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        return -9
+
 
 class Executor:
     """Executes shell commands with streaming output and capture."""
@@ -23,6 +77,35 @@ class Executor:
         self._secrets = secrets or SecretStore()
         self._stream_output = stream_output
 
+    def build_env(self, env: dict[str, str] | None = None) -> dict[str, str] | None:
+        """Environment for a child process: os.environ plus secrets and overrides.
+
+        Returns None when there is nothing to add, so the child simply inherits
+        the environment and os.environ is never copied.
+        """
+        secrets = self._secrets.as_env_dict()
+        if not secrets and not env:
+            return None
+        run_env = os.environ.copy()
+        run_env.update(secrets)
+        if env:
+            run_env.update(env)
+        return run_env
+
+    def _spawn(self, command: str, run_env: dict[str, str] | None) -> "subprocess.Popen[bytes]":
+        """Start a command, exec'ing it directly when plain sh would add nothing."""
+        shell_argv = [self._shell, "-c", command]
+        argv = None
+        if self._shell == DIRECT_EXEC_SHELL:
+            argv = direct_argv(command, (run_env or os.environ).get("PATH"))
+        try:
+            return _popen(argv or shell_argv, run_env)
+        except OSError as e:
+            # A script without a shebang can't be exec'd, but sh runs it as a script
+            if argv is None or e.errno != errno.ENOEXEC:
+                raise
+        return _popen(shell_argv, run_env)
+
     def run(
         self,
         command: str,
@@ -30,67 +113,91 @@ class Executor:
         timeout: int | None = None,
     ) -> ExecutionResult:
         """Execute a command and return the result."""
-        run_env = os.environ.copy()
-        run_env.update(self._secrets.as_env_dict())
-        if env:
-            run_env.update(env)
-
+        run_env = self.build_env(env)
         start = time.monotonic()
-        stdout_lines: list[str] = []
-        stderr_lines: list[str] = []
+        stdout_buf = bytearray()
+        stderr_buf = bytearray()
+        returncode: int | None = None
 
-        try:
-            proc = subprocess.Popen(
-                [self._shell, "-c", command],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                env=run_env,
-                text=True,
-            )
-
-            stdout_thread = threading.Thread(
-                target=self._read_stream,
-                args=(proc.stdout, stdout_lines, True),
-            )
-            stderr_thread = threading.Thread(
-                target=self._read_stream,
-                args=(proc.stderr, stderr_lines, False),
-            )
-            stdout_thread.start()
-            stderr_thread.start()
-
-            proc.wait(timeout=timeout)
-            stdout_thread.join(timeout=5)
-            stderr_thread.join(timeout=5)
-
-            returncode = proc.returncode
-        except subprocess.TimeoutExpired:
-            proc.kill()
-            proc.wait()
-            stdout_thread.join(timeout=5)
-            stderr_thread.join(timeout=5)
-            returncode = -9
-        finally:
-            duration = time.monotonic() - start
-
-        stdout_text = self._secrets.mask("".join(stdout_lines))
-        stderr_text = self._secrets.mask("".join(stderr_lines))
-
-        return ExecutionResult(
+        echo = _LineEcho(self._secrets) if self._stream_output else None
+        deadline = None if timeout is None else start + timeout
+        # Once the shell exits, stop waiting on pipes a background child holds open
+        drain_deadline: float | None = None
+
+        with (
+            self._spawn(command, run_env) as proc,
+            selectors.DefaultSelector() as sel,
+        ):
+            for pipe, buf in ((proc.stdout, stdout_buf), (proc.stderr, stderr_buf)):
+                if pipe is not None:
+                    sel.register(pipe, selectors.EVENT_READ, buf)
+            while sel.get_map():
+                now = time.monotonic()
+                if returncode is None:
+                    returncode = proc.poll()
+                    if returncode is not None:
+                        drain_deadline = now + DRAIN_TIMEOUT
+                    elif deadline is not None and now >= deadline:
+                        proc.kill()
+                        returncode = -9
+                        # Output is cut short anyway; collect what is already buffered
+                        drain_deadline = now + POLL_INTERVAL
+                if drain_deadline is not None and now >= drain_deadline:
+                    break
+                for key, _ in sel.select(POLL_INTERVAL):
+                    chunk = os.read(key.fd, READ_CHUNK_BYTES)
+                    if not chunk:
+                        sel.unregister(key.fileobj)
+                        continue
+                    key.data.extend(chunk)
+                    if echo is not None and key.data is stdout_buf:
+                        echo.feed(chunk)
+            if returncode is None:
+                # Both pipes closed before the process exited; the timeout still applies
+                returncode = _wait_until(proc, deadline)
+        # Leaving the Popen block closed both pipes and reaped the shell
+        if echo is not None:
+            echo.flush()
+        duration = time.monotonic() - start
+
+        # Decoding and masking wait until someone reads stdout/stderr
+        return LazyExecutionResult(
             command=command,
             returncode=returncode,
-            stdout=stdout_text,
-            stderr=stderr_text,
+            raw_stdout=stdout_buf,
+            raw_stderr=stderr_buf,
             duration=duration,
+            mask=self._secrets.mask,
         )
 
-    def _read_stream(self, stream: IO[str] | None, lines: list[str], is_stdout: bool) -> None:
-        """Read a stream line-by-line, optionally printing to console."""
-        if stream is None:
-            return
-        for line in stream:
-            masked = self._secrets.mask(line)
-            lines.append(masked)
-            if self._stream_output and is_stdout:
-                print(masked, end="", flush=True)
-        stream.close()
+
+class _LineEcho:
+    """Echoes streamed bytes to stdout a complete line at a time, masked."""
+
+    def __init__(self, secrets: SecretStore) -> None:
+        self._secrets = secrets
+        # Bound once per command; print() would re-resolve sys.stdout per call
+        self._stream: TextIO = sys.stdout
+        self._decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self._pending = ""
+
+    def feed(self, chunk: bytes) -> None:
+        """Print every complete line received so far."""
+        text = self._pending + self._decoder.decode(chunk)
+        # Mask whole lines only so a secret split across reads is still caught
+        cut = text.rfind("\n") + 1
+        self._pending = text[cut:]
+        if cut:
+            self._write(text[:cut])
+
+    def flush(self) -> None:
+        """Print whatever trails the last newline."""
+        text = self._pending + self._decoder.decode(b"", final=True)
+        self._pending = ""
+        if text:
+            self._write(text)
+
+    def _write(self, text: str) -> None:
+        """Mask and emit text with one write and one flush."""
+        self._stream.write(self._secrets.mask(text))
+        self._stream.flush()
@@ -1,11 +1,16 @@
 """Output capture, formatting, and replay buffer."""
 
+import zlib
 from collections import deque
-from dataclasses import dataclass, field
+from collections.abc import Callable
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 
+# Results whose combined output exceeds this many characters are kept compressed
+COMPRESS_THRESHOLD = 64 * 1024
 
-@dataclass
+
+@dataclass(slots=True)
 class ExecutionResult:
     """Result of a command execution."""
 
@@ -21,20 +26,149 @@ class ExecutionResult:
         """Whether the command exited with code 0."""
         return self.returncode == 0
 
+    @property
+    def output_size(self) -> int:
+        """Combined size of stdout and stderr."""
+        return len(self.stdout) + len(self.stderr)
+
+
+class LazyExecutionResult(ExecutionResult):
+    """ExecutionResult that decodes and masks captured output on first access."""
+
+    __slots__ = ("_raw", "_text", "_mask")
+
+    def __init__(
+        self,
+        command: str,
+        returncode: int,
+        raw_stdout: bytes | bytearray,
+        raw_stderr: bytes | bytearray,
+        duration: float,
+        mask: Callable[[str], str],
+        *,
+        timestamp: datetime | None = None,
+    ) -> None:
+        self.command = command
+        self.returncode = returncode
+        self.duration = duration
+        self.timestamp = timestamp or datetime.now()
+        self._raw = (raw_stdout, raw_stderr)
+        # Decoded stdout/stderr, filled in on first read
+        self._text: list[str | None] = [None, None]
+        self._mask = mask
+
+    def _decoded(self, index: int) -> str:
+        """Decode and mask one captured stream, once."""
+        text = self._text[index]
+        if text is None:
+            text = self._text[index] = self._mask(self._raw[index].decode("utf-8", "replace"))
+        return text
+
+    @property
+    def stdout(self) -> str:  # type: ignore[override]
+        """Captured stdout, decoded and masked."""
+        return self._decoded(0)
+
+    @property
+    def stderr(self) -> str:  # type: ignore[override]
+        """Captured stderr, decoded and masked."""
+        return self._decoded(1)
+
+    @property
+    def raw_stdout(self) -> bytes | bytearray:
+        """Captured stdout bytes as read from the pipe, unmasked."""
+        return self._raw[0]
+
+    @property
+    def raw_stderr(self) -> bytes | bytearray:
+        """Captured stderr bytes as read from the pipe, unmasked."""
+        return self._raw[1]
+
+    @property
+    def mask(self) -> Callable[[str], str]:
+        """Masking function applied when output is first read."""
+        return self._mask
+
+    @property
+    def output_size(self) -> int:
+        """Size of the raw captured output, without decoding it."""
+        return len(self._raw[0]) + len(self._raw[1])
+
+
+@dataclass
+class _PackedResult:
+    """An ExecutionResult with its stdout/stderr held zlib-compressed."""
+
+    result: ExecutionResult
+    stdout: bytes
+    stderr: bytes
+    # Set when the packed bytes are raw captured output that still needs masking
+    mask: Callable[[str], str] | None = None
+
+    @classmethod
+    def pack(cls, result: ExecutionResult) -> "_PackedResult":
+        """Compress a result's output, keeping the rest of its fields.
+
+        Lazy results are packed from their raw bytes, so output nobody has
+        read is never decoded or masked.
+        """
+        shell = ExecutionResult(
+            command=result.command,
+            returncode=result.returncode,
+            stdout="",
+            stderr="",
+            duration=result.duration,
+            timestamp=result.timestamp,
+        )
+        if isinstance(result, LazyExecutionResult):
+            return cls(
+                result=shell,
+                stdout=zlib.compress(result.raw_stdout, 1),
+                stderr=zlib.compress(result.raw_stderr, 1),
+                mask=result.mask,
+            )
+        return cls(
+            result=shell,
+            stdout=zlib.compress(result.stdout.encode(), 1),
+            stderr=zlib.compress(result.stderr.encode(), 1),
+        )
+
+    def unpack(self) -> ExecutionResult:
+        """Rebuild the original result."""
+        if self.mask is not None:
+            return LazyExecutionResult(
+                command=self.result.command,
+                returncode=self.result.returncode,
+                raw_stdout=zlib.decompress(self.stdout),
+                raw_stderr=zlib.decompress(self.stderr),
+                duration=self.result.duration,
+                mask=self.mask,
+                timestamp=self.result.timestamp,
+            )
+        return replace(
+            self.result,
+            stdout=zlib.decompress(self.stdout).decode(),
+            stderr=zlib.decompress(self.stderr).decode(),
+        )
+
 
 class OutputBuffer:
     """Ring buffer for storing command execution results."""
 
     def __init__(self, max_size: int = 50) -> None:
-        self._buffer: deque[ExecutionResult] = deque(maxlen=max_size)
+        self._buffer: deque[ExecutionResult | _PackedResult] = deque(maxlen=max_size)
 
     def add(self, result: ExecutionResult) -> None:
-        """Add a result to the buffer."""
-        self._buffer.append(result)
+        """Add a result to the buffer, compressing large output."""
+        if result.output_size > COMPRESS_THRESHOLD:
+            self._buffer.append(_PackedResult.pack(result))
+        else:
+            self._buffer.append(result)
 
     def last(self, n: int = 0) -> ExecutionResult | None:
         """Get the Nth most recent result. 0 = most recent."""
         idx = len(self._buffer) - 1 - n
         if idx < 0 or idx >= len(self._buffer):
             return None
-        return self._buffer[idx]
+        entry = self._buffer[idx]
+        return entry.unpack() if isinstance(entry, _PackedResult) else entry
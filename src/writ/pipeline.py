@@ -9,17 +9,63 @@ import uuid
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import Any
 
 import yaml
 
+from writ._yaml_cache import load_cached, parse_yaml
 from writ.commands import CommandRegistry
 from writ.exceptions import ConfigError, PipelineError
 from writ.executor import Executor
 from writ.output import ExecutionResult
 from writ.variables import VariableResolver
 
+LOG_BUFFER_BYTES = 65536
+_STEP_PREFIX = "step."
+HEADER_KEYS = frozenset({b"name", b"description"})
+
+
+def _read_header(path: Path, max_lines: int = 32) -> dict[str, Any] | None:
+    """Parse only the leading name/description keys of a YAML pipeline.
+
+    Stops at the first top-level key after both are seen. Returns None when the
+    header can't be isolated within max_lines, so the caller does a full parse.
+    """
+    buf: list[bytes] = []
+    seen: set[bytes] = set()
+    with path.open("rb") as f:
+        for _ in range(max_lines):
+            line = f.readline()
+            if not line:
+                break
+            if line[:1] not in b" \t#-\r\n" and b":" in line:
+                if seen >= HEADER_KEYS:
+                    break
+                seen.add(line.split(b":", 1)[0].strip())
+            buf.append(line)
+        else:
+            return None
+    if not seen >= HEADER_KEYS:
+        return None
+    try:
+        data = parse_yaml(b"".join(buf))
+    except yaml.YAMLError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _read_meta(path: Path) -> dict[str, Any] | None:
+    """Return a YAML pipeline's top-level mapping for listing, or None."""
+    data = _read_header(path)
+    if data is None:
+        try:
+            data = load_cached(path)
+        except yaml.YAMLError:
+            return None
+    return data if isinstance(data, dict) else None
 
-@dataclass
+
+@dataclass(slots=True)
 class PipelineStep:
     """A single step in a YAML pipeline."""
 
@@ -30,7 +76,7 @@ class PipelineStep:
     when: list[dict[str, str]] | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class StepResult:
     """Result of executing a pipeline step."""
 
@@ -40,7 +86,7 @@ class StepResult:
     execution_result: ExecutionResult | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class YamlPipeline:
     """A parsed YAML pipeline."""
 
@@ -50,7 +96,7 @@ class YamlPipeline:
     steps: list[PipelineStep]
 
 
-@dataclass
+@dataclass(slots=True)
 class PipelineInfo:
     """Metadata about a discovered pipeline."""
 
@@ -99,33 +145,39 @@ class PipelineLoader:
 
     def __init__(self, workflows_dir: Path) -> None:
         self._dir = workflows_dir
+        self._index: dict[str, PipelineInfo] | None = None
+
+    @property
+    def workflows_dir(self) -> Path:
+        """Directory scanned for pipelines."""
+        return self._dir
 
     def discover(self) -> list[PipelineInfo]:
         """Scan the workflows directory and return pipeline metadata."""
-        if not self._dir.exists():
+        eligible: list[tuple[str, str, str, Path]] = []
+        try:
+            with os.scandir(self._dir) as it:
+                for entry in it:
+                    filename = entry.name
+                    stem, dot, ext = filename.rpartition(".")
+                    ptype = self.EXTENSIONS.get(dot + ext)
+                    if ptype is None or filename.startswith((".", "__")):
+                        continue
+                    if entry.is_file():
+                        eligible.append((filename, stem, ptype, Path(entry.path)))
+        except OSError:
+            self._index = {}
             return []
+        eligible.sort()
 
         pipelines: list[PipelineInfo] = []
-        for path in sorted(self._dir.iterdir()):
-            if path.suffix not in self.EXTENSIONS:
-                continue
-            if path.name.startswith(".") or path.name.startswith("__"):
-                continue
-
-            ptype = self.EXTENSIONS[path.suffix]
-            name = path.stem
+        for _, name, ptype, path in eligible:
             title = name
             description = ""
-
-            if ptype == "yaml":
-                try:
-                    with open(path) as f:
-                        data = yaml.safe_load(f)
-                    if isinstance(data, dict):
-                        title = data.get("name", name)
-                        description = data.get("description", "")
-                except yaml.YAMLError:
-                    pass
+            data = _read_meta(path) if ptype == "yaml" else None
+            if data is not None:
+                title = data.get("name", name)
+                description = data.get("description", "")
 
             pipelines.append(
                 PipelineInfo(
@@ -136,13 +188,24 @@ class PipelineLoader:
                     description=description,
                 )
             )
+
+        # First file wins when two share a stem (e.g. build.py and build.sh)
+        index: dict[str, PipelineInfo] = {}
+        for info in pipelines:
+            index.setdefault(info.name, info)
+        self._index = index
         return pipelines
 
+    def get(self, name: str) -> PipelineInfo | None:
+        """Look up a pipeline by name from the most recent discovery."""
+        if self._index is None:
+            self.discover()
+        return (self._index or {}).get(name)
+
     def load_yaml(self, path: Path) -> YamlPipeline:
         """Parse a YAML pipeline file."""
         try:
-            with open(path) as f:
-                data = yaml.safe_load(f)
+            data = load_cached(path)
         except yaml.YAMLError as e:
             raise ConfigError(f"Invalid pipeline YAML: {e}") from e
 
@@ -184,19 +247,20 @@ class PipelineRunner:
 
     def run_yaml(self, pipeline: YamlPipeline) -> list[StepResult]:
         """Execute a YAML pipeline and return step results."""
-        # Merge pipeline variables into resolver
-        if pipeline.variables:
-            self._resolver = VariableResolver(
-                config_vars={**self._resolver._config_vars, **pipeline.variables},
-                pipeline_vars=pipeline.variables,
-                secrets=self._resolver._secrets,
-            )
+        with self._resolver.push_pipeline_vars(pipeline.variables):
+            return self._run_steps(pipeline.steps)
 
+    def _run_steps(self, steps: list[PipelineStep]) -> list[StepResult]:
+        """Run steps in order, honouring conditions and on_failure."""
         results: list[StepResult] = []
-        for step in pipeline.steps:
+        # First result per name, matching what a scan of results would find
+        results_by_name: dict[str, StepResult] = {}
+        for step in steps:
             # Evaluate conditions
-            if step.when and not self._evaluate_conditions(step.when, results):
-                results.append(StepResult(step_name=step.name, succeeded=True, skipped=True))
+            if step.when and not self._evaluate_conditions(step.when, results, results_by_name):
+                skipped = StepResult(step_name=step.name, succeeded=True, skipped=True)
+                results.append(skipped)
+                results_by_name.setdefault(step.name, skipped)
                 continue
 
             # Resolve and execute
@@ -207,6 +271,7 @@ class PipelineRunner:
                 execution_result=exec_result,
             )
             results.append(step_result)
+            results_by_name.setdefault(step.name, step_result)
 
             # Handle failure
             if not exec_result.succeeded:
@@ -251,7 +316,8 @@ class PipelineRunner:
         """
         fork_id = str(uuid.uuid4())
         log_path = log_dir / f"{fork_id}.log"
-        log_file = open(log_path, "w")  # noqa: SIM115 -- closed by daemon thread
+        # Closed by the daemon thread once the script exits
+        log_file = open(log_path, "wb", buffering=LOG_BUFFER_BYTES)  # noqa: SIM115
 
         start_time = datetime.now()
         header = (
@@ -259,11 +325,11 @@ class PipelineRunner:
             f"Started: {start_time.isoformat(timespec='seconds')}\n"
             f"Script: {path}\n"
         )
-        log_file.write(header)
+        log_file.write(header.encode())
+        # Must reach the file before the child inherits the descriptor
         log_file.flush()
 
-        run_env = os.environ.copy()
-        run_env.update(self._executor._secrets.as_env_dict())
+        run_env = self._executor.build_env()
 
         try:
             proc = subprocess.Popen(
@@ -279,9 +345,7 @@ class PipelineRunner:
         # NOTE: PID/Log lines written after Popen; fast scripts may interleave
         # output before these lines. Acceptable trade-off — PID is only
         # available after the process starts.
-        log_file.write(f"PID: {proc.pid}\n")
-        log_file.write(f"Log: {log_path}\n")
-        log_file.write("---\n")
+        log_file.write(f"PID: {proc.pid}\nLog: {log_path}\n---\n".encode())
         log_file.flush()
 
         start_mono = time.monotonic()
@@ -295,7 +359,7 @@ class PipelineRunner:
                 f"Finished: {end_time.isoformat(timespec='seconds')}\n"
                 f"Exit code: {proc.returncode}\n"
                 f"Duration: {duration:.1f}s\n"
-                f"---\n"
+                f"---\n".encode()
             )
             log_file.close()
 
@@ -318,7 +382,10 @@ class PipelineRunner:
         )
 
     def _evaluate_conditions(
-        self, conditions: list[dict[str, str]], results: list[StepResult]
+        self,
+        conditions: list[dict[str, str]],
+        results: list[StepResult],
+        results_by_name: dict[str, StepResult],
     ) -> bool:
         """Evaluate all conditions (AND logic). Return True if all pass."""
         for condition in conditions:
@@ -331,9 +398,9 @@ class PipelineRunner:
                         return False
                     if expected == "failed" and prev.succeeded:
                         return False
-                elif key.startswith("step."):
-                    step_name = key[5:]
-                    step_result = next((r for r in results if r.step_name == step_name), None)
+                elif key.startswith(_STEP_PREFIX):
+                    step_name = key[len(_STEP_PREFIX) :]
+                    step_result = results_by_name.get(step_name)
                     if step_result is None:
                         return False
                     if expected == "succeeded" and not step_result.succeeded:
@@ -341,11 +408,7 @@ class PipelineRunner:
                     if expected == "failed" and step_result.succeeded:
                         return False
                 else:
-                    # Variable check
-                    try:
-                        actual = self._resolver.resolve(f"${{{key}}}")
-                        if actual != expected:
-                            return False
-                    except Exception:
+                    # Variable check; undefined variables never match
+                    if self._resolver.lookup(key) != expected:
                         return False
         return True
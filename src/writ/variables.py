@@ -2,11 +2,14 @@
 
 import os
 import re
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
 from writ.exceptions import VariableError
 
 VAR_PATTERN = re.compile(r"\$\{([^}]+)\}")
+RESOLVE_CACHE_SIZE = 512
 
 
 class SecretStore:
@@ -14,10 +17,19 @@ class SecretStore:
 
     def __init__(self) -> None:
         self._secrets: dict[str, str] = {}
+        self._masker: re.Pattern[str] | None = None
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Counter bumped whenever the set of secrets changes."""
+        return self._version
 
     def add(self, key: str, value: str) -> None:
         """Add a secret."""
         self._secrets[key] = value
+        self._masker = None
+        self._version += 1
 
     def get(self, key: str) -> str | None:
         """Get a secret value by key."""
@@ -33,23 +45,27 @@ class SecretStore:
 
     def mask(self, text: str) -> str:
         """Replace all secret values in text with '***'."""
-        result = text
-        for value in sorted(self._secrets.values(), key=len, reverse=True):
-            if value:
-                result = result.replace(value, "***")
-        return result
+        if not self._secrets:
+            return text
+        if self._masker is None:
+            values = sorted({v for v in self._secrets.values() if v}, key=len, reverse=True)
+            if not values:
+                return text
+            # Longest first so a secret that contains another is masked whole
+            self._masker = re.compile("|".join(map(re.escape, values)))
+        return self._masker.sub("***", text)
 
     def load_dotenv(self, path: Path) -> None:
         """Load secrets from a .env file."""
         if not path.exists():
             return
-        with open(path) as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith("#") or "=" not in line:
-                    continue
-                key, _, value = line.partition("=")
-                self._secrets[key.strip()] = value.strip()
+        for line in path.read_text(encoding="utf-8").splitlines():
+            key, sep, value = line.partition("=")
+            key = key.strip()
+            if sep and key and not key.startswith("#"):
+                self._secrets[key] = value.strip()
+        self._masker = None
+        self._version += 1
 
 
 class VariableResolver:
@@ -64,23 +80,86 @@ class VariableResolver:
         self._config_vars = config_vars
         self._pipeline_vars = pipeline_vars or {}
         self._secrets = secrets or SecretStore()
+        self._resolved: dict[str, str] = {}
+        self._merged: dict[str, str] | None = None
+        self._merged_version = self._secrets.version
+
+    def _invalidate(self) -> None:
+        """Forget the flattened scope and memoized templates."""
+        self._merged = None
+        self._resolved.clear()
+
+    @contextmanager
+    def push_pipeline_vars(self, variables: dict[str, str]) -> Iterator[None]:
+        """Layer variables over the pipeline scope until the block exits."""
+        if not variables:
+            yield
+            return
+        previous = self._pipeline_vars
+        self._pipeline_vars = {**previous, **variables}
+        self._invalidate()
+        try:
+            yield
+        finally:
+            self._pipeline_vars = previous
+            self._invalidate()
+
+    def _scope(self) -> dict[str, str]:
+        """Secrets, config and pipeline variables flattened by precedence."""
+        if self._merged_version != self._secrets.version:
+            self._invalidate()
+            self._merged_version = self._secrets.version
+        if self._merged is None:
+            self._merged = {
+                **self._secrets.as_env_dict(),
+                **self._config_vars,
+                **self._pipeline_vars,
+            }
+        return self._merged
+
+    def lookup(self, name: str) -> str | None:
+        """Return the value of a single variable, or None if it is undefined."""
+        # Resolution order: pipeline > config > secrets > env
+        value = self._scope().get(name)
+        return value if value is not None else os.environ.get(name)
 
     def resolve(self, text: str) -> str:
         """Resolve all ${var} references in text."""
-
-        def _replace(match: re.Match[str]) -> str:
-            var_name = match.group(1)
-            # Resolution order: pipeline > config > secrets > env
-            if var_name in self._pipeline_vars:
-                return self._pipeline_vars[var_name]
-            if var_name in self._config_vars:
-                return self._config_vars[var_name]
-            secret = self._secrets.get(var_name)
-            if secret is not None:
-                return secret
-            env_val = os.environ.get(var_name)
-            if env_val is not None:
-                return env_val
-            raise VariableError(f"Unresolved variable: {var_name}")
-
-        return VAR_PATTERN.sub(_replace, text)
+        if "${" not in text:
+            return text
+        scope = self._scope()
+        cached = self._resolved.get(text)
+        if cached is not None:
+            return cached
+
+        # Same matches as VAR_PATTERN.finditer, found with str.find
+        parts: list[str] = []
+        last = pos = 0
+        used_env = False
+        while (start := text.find("${", pos)) != -1:
+            end = text.find("}", start + 2)
+            if end == -1:
+                break
+            if end == start + 2:
+                # "${}" is left as-is
+                pos = start + 1
+                continue
+            var_name = text[start + 2 : end]
+            value = scope.get(var_name)
+            if value is None:
+                value = os.environ.get(var_name)
+                if value is None:
+                    raise VariableError(f"Unresolved variable: {var_name}")
+                used_env = True
+            parts.append(text[last:start])
+            parts.append(value)
+            last = pos = end + 1
+        parts.append(text[last:])
+        result = "".join(parts)
+
+        # Environment lookups stay live; only template-local results are memoized
+        if not used_env:
+            if len(self._resolved) >= RESOLVE_CACHE_SIZE:
+                self._resolved.clear()
+            self._resolved[text] = result
+        return result
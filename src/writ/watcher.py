@@ -0,0 +1,71 @@
+"""Wait for appends to a file, using inotify on Linux."""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import time
+from types import TracebackType
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+
+def _inotify_watch(path: str) -> int:
+    """Open an inotify descriptor watching path. Return -1 if unavailable."""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+    except (OSError, AttributeError):
+        return -1
+    if fd < 0:
+        return -1
+    if libc.inotify_add_watch(fd, os.fsencode(path), IN_MODIFY | IN_CLOSE_WRITE) < 0:
+        os.close(fd)
+        return -1
+    return int(fd)
+
+
+class FileWatcher:
+    """Blocks until a file changes, falling back to polling without inotify."""
+
+    def __init__(self, path: str, poll_interval: float = 0.2) -> None:
+        self._poll_interval = poll_interval
+        self._fd = _inotify_watch(path) if sys.platform.startswith("linux") else -1
+
+    @property
+    def uses_inotify(self) -> bool:
+        """Whether change notifications come from the kernel."""
+        return self._fd >= 0
+
+    def wait(self, timeout: float = 1.0) -> None:
+        """Block until the file is modified or timeout seconds pass."""
+        if self._fd < 0:
+            time.sleep(self._poll_interval)
+            return
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if ready:
+            try:
+                os.read(self._fd, 4096)
+            except BlockingIOError:
+                pass
+
+    def close(self) -> None:
+        """Release the inotify descriptor."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self) -> "FileWatcher":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
@@ -1,10 +1,14 @@
 """Tests for the REPL app."""
 
+import os
+import shutil
+import threading
 from pathlib import Path
+from unittest.mock import MagicMock, patch
 
 import pytest
 
-from writ.app import ReplApp, parse_input
+from writ.app import BUILTINS, ReplApp, parse_input
 from writ.commands import CommandRegistry
 from writ.config import CommandConfig, ReplSettings
 from writ.pipeline import PipelineLoader
@@ -51,6 +55,26 @@ class TestParseInput:
         assert cmd == "mode"
         assert args == "strict"
 
+    def test_parses_tab_separated_args(self) -> None:
+        cmd, args = parse_input("last\t3")
+        assert cmd == "last"
+        assert args == "3"
+
+    def test_parses_newline_separated_args(self) -> None:
+        cmd, args = parse_input("ls\nfoo")
+        assert cmd == "ls"
+        assert args == "foo"
+
+    def test_parses_vertical_tab_separated_args(self) -> None:
+        cmd, args = parse_input("last\x0b3")
+        assert cmd == "last"
+        assert args == "3"
+
+    def test_parses_non_breaking_space_separated_args(self) -> None:
+        cmd, args = parse_input("mode\xa0strict")
+        assert cmd == "mode"
+        assert args == "strict"
+
 
 class TestReplApp:
     @pytest.fixture
@@ -118,6 +142,35 @@ class TestReplApp:
         assert "Run linter" in output
         assert "quality" in output
 
+    def test_handle_help_lists_builtins_and_commands(
+        self, settings: ReplSettings, registry: CommandRegistry, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        app = ReplApp(settings=settings, config_dir=Path("."), workflows_dir=Path("."))
+        app._registry = registry
+        app._handle_help("")
+        output = capsys.readouterr().out
+        assert output.startswith("Built-in commands:\n")
+        assert "  pipeline\n" in output
+        assert "  lint (l)  -- Run linter" in output
+        assert "Tags: quality" in output
+
+    def test_handle_help_for_command(
+        self, settings: ReplSettings, registry: CommandRegistry, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        app = ReplApp(settings=settings, config_dir=Path("."), workflows_dir=Path("."))
+        app._registry = registry
+        app._handle_help("l")
+        output = capsys.readouterr().out
+        assert "  lint: Run linter\n  Command: echo lint\n  Aliases: l\n" in output
+
+    def test_handle_help_filters_by_tag(
+        self, settings: ReplSettings, registry: CommandRegistry, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        app = ReplApp(settings=settings, config_dir=Path("."), workflows_dir=Path("."))
+        app._registry = registry
+        app._handle_help("--tag quality")
+        assert capsys.readouterr().out == "  lint (l)  -- Run linter\n"
+
     def test_handle_commands_empty_registry(
         self, settings: ReplSettings, capsys: pytest.CaptureFixture[str]
     ) -> None:
@@ -127,6 +180,139 @@ class TestReplApp:
         assert "No commands configured" in output
 
 
+class TestLoadConfig:
+    def test_reload_skips_unchanged_commands_yaml(self, tmp_path: Path) -> None:
+        (tmp_path / "commands.yaml").write_text(
+            "commands:\n  lint:\n    description: Lint\n    command: echo lint\n"
+        )
+        app = ReplApp(settings=ReplSettings(), config_dir=tmp_path, workflows_dir=tmp_path)
+        app.load_config()
+        registry = app._registry
+        with patch("writ.app.load_commands_config") as mock_load:
+            app.load_config()
+        mock_load.assert_not_called()
+        assert app._registry is registry
+
+    def test_reload_picks_up_edited_commands_yaml(self, tmp_path: Path) -> None:
+        commands_path = tmp_path / "commands.yaml"
+        commands_path.write_text(
+            "commands:\n  lint:\n    description: Lint\n    command: echo lint\n"
+        )
+        app = ReplApp(settings=ReplSettings(), config_dir=tmp_path, workflows_dir=tmp_path)
+        app.load_config()
+        commands_path.write_text(
+            "commands:\n  unit-test:\n    description: Test\n    command: echo test\n"
+        )
+        app.load_config()
+        assert app._registry.has("unit-test")
+        assert not app._registry.has("lint")
+
+    def test_resolver_shared_until_commands_reload(self, tmp_path: Path) -> None:
+        commands_path = tmp_path / "commands.yaml"
+        commands_path.write_text("variables:\n  env: dev\ncommands: {}\n")
+        app = ReplApp(settings=ReplSettings(), config_dir=tmp_path, workflows_dir=tmp_path)
+        app.load_config()
+        resolver = app._make_resolver()
+        assert app._make_resolver() is resolver
+        assert app._make_resolver({"x": "1"}) is not resolver
+
+        commands_path.write_text("variables:\n  env: production\ncommands: {}\n")
+        app.load_config()
+        assert app._make_resolver().resolve("${env}") == "production"
+
+    def test_reload_skips_unchanged_dotenv(self, tmp_path: Path) -> None:
+        dotenv = tmp_path / ".env"
+        dotenv.write_text("TOKEN=abc\n")
+        settings = ReplSettings(dotenv_path=str(dotenv))
+        app = ReplApp(settings=settings, config_dir=tmp_path, workflows_dir=tmp_path)
+        app.load_config()
+        assert app._secrets.get("TOKEN") == "abc"
+        with patch.object(app._secrets, "load_dotenv") as mock_load:
+            app.load_config()
+        mock_load.assert_not_called()
+
+        dotenv.write_text("TOKEN=changed\n")
+        app.load_config()
+        assert app._secrets.get("TOKEN") == "changed"
+
+    def test_reload_refreshes_completer_words(self, tmp_path: Path) -> None:
+        from prompt_toolkit.completion import WordCompleter
+
+        app = ReplApp(settings=ReplSettings(), config_dir=tmp_path, workflows_dir=tmp_path)
+        completer = WordCompleter(app.get_completions())
+        app._completer = completer
+        (tmp_path / "commands.yaml").write_text(
+            "commands:\n  lint:\n    description: Lint\n    command: echo lint\n"
+        )
+        app._handle_reload()
+        assert app._completer is completer
+        assert "lint" in completer.words
+
+
+class TestConfirm:
+    @pytest.fixture
+    def app(self) -> ReplApp:
+        app = ReplApp(settings=ReplSettings(), config_dir=Path("."), workflows_dir=Path("."))
+        app._registry = CommandRegistry(
+            {
+                "deploy": CommandConfig(
+                    name="deploy", description="Deploy", command="echo deploy", confirm=True
+                )
+            }
+        )
+        return app
+
+    def test_declined_confirm_cancels(
+        self, app: ReplApp, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        with patch("builtins.input", return_value="n"):
+            app._execute_config_command("deploy")
+        assert "Cancelled." in capsys.readouterr().out
+        assert app._output_buffer.last() is None
+
+    def test_uses_confirm_session_when_running(
+        self, app: ReplApp, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        session = MagicMock()
+        session.prompt.return_value = "N"
+        app._confirm_session = session
+        with patch("builtins.input") as mock_input:
+            app._execute_config_command("deploy")
+        session.prompt.assert_called_once_with("  Run 'deploy'? [y/N] ")
+        mock_input.assert_not_called()
+        assert "Cancelled." in capsys.readouterr().out
+
+
+class TestDispatch:
+    @pytest.fixture
+    def app(self) -> ReplApp:
+        return ReplApp(
+            settings=ReplSettings(mode="strict"), config_dir=Path("."), workflows_dir=Path(".")
+        )
+
+    def test_exit_stops_loop(self, app: ReplApp) -> None:
+        assert app._dispatch("exit") is False
+        assert app._dispatch("quit") is False
+
+    def test_empty_input_continues(self, app: ReplApp) -> None:
+        assert app._dispatch("   ") is True
+
+    def test_builtin_routes_to_handler(
+        self, app: ReplApp, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        assert app._dispatch("mode") is True
+        assert "Current mode: strict" in capsys.readouterr().out
+
+    def test_every_builtin_has_a_handler(self) -> None:
+        assert set(ReplApp._HANDLERS) | {"exit", "quit"} == BUILTINS
+
+    def test_unknown_command_in_strict_mode(
+        self, app: ReplApp, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        assert app._dispatch("nope") is True
+        assert "Unknown command: nope" in capsys.readouterr().out
+
+
 class TestPipelineFork:
     @pytest.fixture
     def app_with_workflows(self, tmp_path: Path) -> ReplApp:
@@ -183,6 +369,64 @@ class TestPipelineFork:
         output = capsys.readouterr().out
         assert "not found" in output.lower()
 
+    def test_show_yaml_pipeline_lists_steps(
+        self, app_with_workflows: ReplApp, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        wf_dir = tmp_path / "workflows"
+        (wf_dir / "deploy.yaml").write_text(
+            "name: Deploy\ndescription: ship it\nsteps:\n"
+            "  - name: build\n    run: make\n"
+            "  - name: push\n    run: make push\n    when: {prev.success: true}\n"
+        )
+        app_with_workflows._pipeline_loader = PipelineLoader(wf_dir)
+        app_with_workflows._handle_pipeline("show deploy")
+        assert capsys.readouterr().out == (
+            "Pipeline: Deploy\n"
+            "Description: ship it\n"
+            "Steps:\n"
+            "  1. build: make (on_failure=abort)\n"
+            "  2. push: make push (on_failure=abort)\n"
+            "     when: {'prev.success': True}\n"
+        )
+
+
+class TestPipelineDiscoveryCache:
+    def test_reuses_scan_until_directory_changes(self, tmp_path: Path) -> None:
+        wf_dir = tmp_path / "workflows"
+        wf_dir.mkdir()
+        (wf_dir / "a.sh").write_text("echo a\n")
+        app = ReplApp(settings=ReplSettings(), config_dir=tmp_path, workflows_dir=wf_dir)
+        loader = app._pipeline_loader
+        with patch.object(loader, "discover", wraps=loader.discover) as mock_discover:
+            assert [p.name for p in app._discover_cached()] == ["a"]
+            assert [p.name for p in app._discover_cached()] == ["a"]
+            assert mock_discover.call_count == 1
+
+            (wf_dir / "b.sh").write_text("echo b\n")
+            os.utime(wf_dir, ns=(0, wf_dir.stat().st_mtime_ns + 1_000_000))
+            assert [p.name for p in app._discover_cached()] == ["a", "b"]
+            assert mock_discover.call_count == 2
+
+    def test_missing_directory_returns_empty(self, tmp_path: Path) -> None:
+        app = ReplApp(
+            settings=ReplSettings(), config_dir=tmp_path, workflows_dir=tmp_path / "missing"
+        )
+        assert app._discover_cached() == []
+
+    def test_show_after_directory_removed_reports_not_found(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        wf_dir = tmp_path / "workflows"
+        wf_dir.mkdir()
+        (wf_dir / "deploy.sh").write_text("echo deploy\n")
+        app = ReplApp(settings=ReplSettings(), config_dir=tmp_path, workflows_dir=wf_dir)
+        app._handle_pipeline("list")
+        shutil.rmtree(wf_dir)
+        capsys.readouterr()
+
+        app._handle_pipeline("show deploy")
+        assert "Pipeline not found: deploy" in capsys.readouterr().out
+
 
 class TestPipelineLogs:
     @pytest.fixture
@@ -205,6 +449,15 @@ class TestPipelineLogs:
         output = capsys.readouterr().out
         assert "No logs found" in output
 
+    def test_logs_missing_directory(
+        self, app_with_logs: ReplApp, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        app_with_logs._logs_dir = tmp_path / "absent"
+        app_with_logs._handle_pipeline("logs list")
+        app_with_logs._logs_tail("abc")
+        output = capsys.readouterr().out
+        assert output == "No logs found.\nLog not found: abc\n"
+
     def test_logs_list_shows_entries(
         self, app_with_logs: ReplApp, tmp_path: Path, capsys: pytest.CaptureFixture[str]
     ) -> None:
@@ -248,6 +501,26 @@ class TestPipelineLogs:
         assert "build" in output
         assert "running" in output
 
+    def test_logs_list_reads_trailer_of_large_log(
+        self, app_with_logs: ReplApp, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        logs_dir = tmp_path / "logs"
+        log_file = logs_dir / "ccc12345-1234-1234-1234-123456789abc.log"
+        log_file.write_text(
+            "--- FORK: bulk ---\n"
+            "Started: 2026-02-22T16:00:00\n"
+            "---\n" + "noisy output line\n" * 10_000 + "\n---\n"
+            "Finished: 2026-02-22T16:05:00\n"
+            "Exit code: 3\n"
+            "Duration: 300.0s\n"
+            "---\n"
+        )
+        app_with_logs._handle_pipeline("logs list")
+        output = capsys.readouterr().out
+        assert "bulk" in output
+        assert "2026-02-22T16:00:00" in output
+        assert "exit 3" in output
+
     def test_logs_tail_reads_content(
         self, app_with_logs: ReplApp, tmp_path: Path, capsys: pytest.CaptureFixture[str]
     ) -> None:
@@ -269,6 +542,42 @@ class TestPipelineLogs:
         assert "line one" in output
         assert "line two" in output
 
+    def test_logs_tail_starts_near_end_of_large_log(
+        self, app_with_logs: ReplApp, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        logs_dir = tmp_path / "logs"
+        log_file = logs_dir / "eee11111-2222-3333-4444-555566667777.log"
+        body = "".join(f"output {i}\n" for i in range(5000))
+        log_file.write_text(
+            f"--- FORK: big ---\n---\n{body}\n---\nFinished: now\nExit code: 0\n---\n"
+        )
+        app_with_logs._logs_tail("eee1")
+        output = capsys.readouterr().out
+        assert "output 4999" in output
+        assert "output 4000\n" not in output
+        assert "--- FORK" not in output
+        assert "(following" not in output
+
+    def test_logs_tail_follows_until_trailer(
+        self, app_with_logs: ReplApp, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        logs_dir = tmp_path / "logs"
+        log_file = logs_dir / "ddd11111-2222-3333-4444-555566667777.log"
+        log_file.write_text("--- FORK: slow ---\n---\nfirst\n")
+
+        def _finish() -> None:
+            with open(log_file, "a") as f:
+                f.write("second\n\n---\nFinished: now\nExit code: 0\n---\n")
+
+        timer = threading.Timer(0.1, _finish)
+        timer.start()
+        app_with_logs._logs_tail("ddd1")
+        timer.join()
+        output = capsys.readouterr().out
+        assert "first" in output
+        assert "second" in output
+        assert "Exit code: 0" in output
+
     def test_logs_tail_partial_uuid_match(
         self, app_with_logs: ReplApp, tmp_path: Path, capsys: pytest.CaptureFixture[str]
     ) -> None:
@@ -279,6 +588,33 @@ class TestPipelineLogs:
         output = capsys.readouterr().out
         assert "output here" in output
 
+    def test_logs_tail_full_id_skips_scan(
+        self, app_with_logs: ReplApp, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        fork_id = "ccc33333-0000-0000-0000-000000000000"
+        (tmp_path / "logs" / f"{fork_id}.log").write_text("---\nfull id\n\n---\nExit code: 0\n")
+        with patch.object(app_with_logs, "_find_logs") as mock_find:
+            app_with_logs._logs_tail(fork_id)
+        mock_find.assert_not_called()
+        assert "full id" in capsys.readouterr().out
+
+    def test_logs_tail_rejects_path_outside_logs_dir(
+        self, app_with_logs: ReplApp, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        (tmp_path / "outside.log").write_text("secret\n")
+        app_with_logs._logs_tail("../outside")
+        assert capsys.readouterr().out == "Log not found: ../outside\n"
+
+    def test_logs_tail_ambiguous_prefix(
+        self, app_with_logs: ReplApp, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        logs_dir = tmp_path / "logs"
+        (logs_dir / "eee11111-0000-0000-0000-000000000000.log").write_text("a\n")
+        (logs_dir / "eee22222-0000-0000-0000-000000000000.log").write_text("b\n")
+        app_with_logs._logs_tail("eee")
+        output = capsys.readouterr().out
+        assert "Ambiguous prefix" in output
+
     def test_logs_tail_not_found(
         self, app_with_logs: ReplApp, capsys: pytest.CaptureFixture[str]
     ) -> None:
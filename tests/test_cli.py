@@ -11,13 +11,13 @@ from writ.cli import run_config, run_init
 class TestRunInit:
     def test_creates_directory(self, tmp_path: Path) -> None:
         writ_home = tmp_path / ".auto-writ"
-        with patch("writ.cli.WRIT_HOME", writ_home):
+        with patch("writ.cli.WRIT_HOME_EXPANDED", writ_home):
             run_init()
         assert writ_home.is_dir()
 
     def test_creates_settings_yaml(self, tmp_path: Path) -> None:
         writ_home = tmp_path / ".auto-writ"
-        with patch("writ.cli.WRIT_HOME", writ_home):
+        with patch("writ.cli.WRIT_HOME_EXPANDED", writ_home):
             run_init()
         settings_path = writ_home / "settings.yaml"
         assert settings_path.exists()
@@ -28,7 +28,7 @@ class TestRunInit:
 
     def test_creates_commands_yaml(self, tmp_path: Path) -> None:
         writ_home = tmp_path / ".auto-writ"
-        with patch("writ.cli.WRIT_HOME", writ_home):
+        with patch("writ.cli.WRIT_HOME_EXPANDED", writ_home):
             run_init()
         commands_path = writ_home / "commands.yaml"
         assert commands_path.exists()
@@ -39,7 +39,7 @@ class TestRunInit:
 
     def test_idempotent(self, tmp_path: Path) -> None:
         writ_home = tmp_path / ".auto-writ"
-        with patch("writ.cli.WRIT_HOME", writ_home):
+        with patch("writ.cli.WRIT_HOME_EXPANDED", writ_home):
             run_init()
 
         settings_path = writ_home / "settings.yaml"
@@ -48,7 +48,7 @@ class TestRunInit:
         # Modify file to prove it won't be overwritten
         settings_path.write_text("custom: true\n")
 
-        with patch("writ.cli.WRIT_HOME", writ_home):
+        with patch("writ.cli.WRIT_HOME_EXPANDED", writ_home):
             run_init()
 
         assert settings_path.read_text() == "custom: true\n"
@@ -56,7 +56,7 @@ class TestRunInit:
 
     def test_prints_created_paths(self, tmp_path: Path, capsys: object) -> None:
         writ_home = tmp_path / ".auto-writ"
-        with patch("writ.cli.WRIT_HOME", writ_home):
+        with patch("writ.cli.WRIT_HOME_EXPANDED", writ_home):
             run_init()
         captured = capsys.readouterr()  # type: ignore[union-attr]
         assert str(writ_home) in captured.out
@@ -65,19 +65,19 @@ class TestRunInit:
 
     def test_creates_logs_directory(self, tmp_path: Path) -> None:
         writ_home = tmp_path / ".auto-writ"
-        with patch("writ.cli.WRIT_HOME", writ_home):
+        with patch("writ.cli.WRIT_HOME_EXPANDED", writ_home):
             run_init()
         assert (writ_home / "logs").is_dir()
 
     def test_creates_workflows_directory(self, tmp_path: Path) -> None:
         writ_home = tmp_path / ".auto-writ"
-        with patch("writ.cli.WRIT_HOME", writ_home):
+        with patch("writ.cli.WRIT_HOME_EXPANDED", writ_home):
             run_init()
         assert (writ_home / "workflows").is_dir()
 
     def test_logs_dir_idempotent(self, tmp_path: Path) -> None:
         writ_home = tmp_path / ".auto-writ"
-        with patch("writ.cli.WRIT_HOME", writ_home):
+        with patch("writ.cli.WRIT_HOME_EXPANDED", writ_home):
             run_init()
             run_init()
         assert (writ_home / "logs").is_dir()
@@ -85,7 +85,7 @@ class TestRunInit:
 
     def test_prints_already_initialized(self, tmp_path: Path, capsys: object) -> None:
         writ_home = tmp_path / ".auto-writ"
-        with patch("writ.cli.WRIT_HOME", writ_home):
+        with patch("writ.cli.WRIT_HOME_EXPANDED", writ_home):
             run_init()
             run_init()
         captured = capsys.readouterr()  # type: ignore[union-attr]
@@ -98,7 +98,7 @@ class TestRunConfig:
         writ_home.mkdir()
         (writ_home / "settings.yaml").write_text("writ: {}\n")
         with (
-            patch("writ.cli.WRIT_HOME", writ_home),
+            patch("writ.cli.WRIT_HOME_EXPANDED", writ_home),
             patch("writ.cli.subprocess.run") as mock_run,
         ):
             run_config(editor="vim", target="settings")
@@ -109,7 +109,7 @@ class TestRunConfig:
         writ_home.mkdir()
         (writ_home / "commands.yaml").write_text("commands: {}\n")
         with (
-            patch("writ.cli.WRIT_HOME", writ_home),
+            patch("writ.cli.WRIT_HOME_EXPANDED", writ_home),
             patch("writ.cli.subprocess.run") as mock_run,
         ):
             run_config(editor="nano", target="commands")
@@ -117,7 +117,7 @@ class TestRunConfig:
 
     def test_requires_init_first(self, tmp_path: Path, capsys: object) -> None:
         writ_home = tmp_path / ".auto-writ"  # Does not exist
-        with patch("writ.cli.WRIT_HOME", writ_home):
+        with patch("writ.cli.WRIT_HOME_EXPANDED", writ_home):
             run_config(editor="vim")
         captured = capsys.readouterr()  # type: ignore[union-attr]
         assert "Config directory not found" in captured.out
@@ -127,7 +127,7 @@ class TestRunConfig:
         writ_home = tmp_path / ".auto-writ"
         writ_home.mkdir()
         (writ_home / "settings.yaml").write_text("writ: {}\n")
-        with patch("writ.cli.WRIT_HOME", writ_home):
+        with patch("writ.cli.WRIT_HOME_EXPANDED", writ_home):
             run_config(editor="notepad")
         captured = capsys.readouterr()  # type: ignore[union-attr]
         assert "Unknown editor: notepad" in captured.out
@@ -136,7 +136,7 @@ class TestRunConfig:
         writ_home = tmp_path / ".auto-writ"
         writ_home.mkdir()
         # No settings.yaml created
-        with patch("writ.cli.WRIT_HOME", writ_home):
+        with patch("writ.cli.WRIT_HOME_EXPANDED", writ_home):
             run_config(editor="vim")
         captured = capsys.readouterr()  # type: ignore[union-attr]
         assert "Config file not found" in captured.out
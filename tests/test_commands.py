@@ -71,3 +71,42 @@ class TestCommandRegistry:
     def test_all_tags(self, registry: CommandRegistry) -> None:
         tags = registry.all_tags()
         assert sorted(tags) == ["deploy", "quality", "test"]
+        assert registry.all_tags() is tags
+
+    def test_all_names_and_aliases(self, registry: CommandRegistry) -> None:
+        assert registry.all_names_and_aliases == ("deploy", "l", "lint", "t", "test")
+
+    def test_iter_aliases(self, registry: CommandRegistry) -> None:
+        assert sorted(registry.iter_aliases()) == ["l", "t"]
+
+    def test_needs_resolve(self, registry: CommandRegistry) -> None:
+        assert registry.needs_resolve("lint") is False
+        templated = CommandRegistry(
+            {"release": CommandConfig(name="release", description="", command="tag ${version}")}
+        )
+        assert templated.needs_resolve("release") is True
+
+    def test_lookup_without_aliases(self) -> None:
+        registry = CommandRegistry(
+            {"build": CommandConfig(name="build", description="", command="make")}
+        )
+        assert registry.has("build") is True
+        assert registry.has("b") is False
+        assert registry.get("build").command == "make"
+        with pytest.raises(CommandNotFoundError):
+            registry.get("b")
+
+    def test_name_takes_precedence_over_alias(self) -> None:
+        registry = CommandRegistry(
+            {
+                "build": CommandConfig(name="build", description="", command="make"),
+                "bundle": CommandConfig(
+                    name="bundle", description="", command="zip", aliases=["build"]
+                ),
+            }
+        )
+        assert registry.get("build").command == "make"
+
+    def test_filter_by_tag_returns_a_copy(self, registry: CommandRegistry) -> None:
+        registry.filter_by_tag("quality").clear()
+        assert [c.name for c in registry.filter_by_tag("quality")] == ["lint", "test"]
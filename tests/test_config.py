@@ -34,6 +34,10 @@ class TestLoadSettings:
         assert settings.shell == "/bin/sh"
         assert settings.buffer_size == 10
 
+    def test_history_path_expands_tilde(self) -> None:
+        settings = ReplSettings(history_file="~/.writ_history")
+        assert settings.history_path == Path.home() / ".writ_history"
+
     def test_raises_on_missing_file(self, tmp_path: Path) -> None:
         with pytest.raises(ConfigError, match="not found"):
             load_settings(tmp_path / "nonexistent.yaml")
@@ -76,6 +80,10 @@ class TestLoadCommandsConfig:
         assert lint.tags == ["quality"]
         assert lint.confirm is False
 
+    def test_command_config_uses_slots(self, valid_commands_path: Path) -> None:
+        lint = load_commands_config(valid_commands_path).commands["lint"]
+        assert not hasattr(lint, "__dict__")
+
     def test_command_with_confirm_and_timeout(self, valid_commands_path: Path) -> None:
         config = load_commands_config(valid_commands_path)
         deploy = config.commands["deploy"]
@@ -1,17 +1,67 @@
 """Tests for shell command execution."""
 
+import time
+from pathlib import Path
+from unittest.mock import patch
+
 import pytest
 
-from writ.executor import Executor
+from writ.executor import Executor, direct_argv
 from writ.output import ExecutionResult
 from writ.variables import SecretStore
 
 
+class TestDirectArgv:
+    def test_simple_command_skips_shell(self) -> None:
+        argv = direct_argv("echo hello world")
+        assert argv is not None
+        assert argv[0].endswith("/echo")
+        assert argv[1:] == ["hello", "world"]
+
+    @pytest.mark.parametrize(
+        "command",
+        [
+            "echo $HOME",
+            "ls | wc -l",
+            "echo hi > out.txt",
+            "ls *.py",
+            "echo 'quoted'",
+            "cd /tmp",
+            "exit 42",
+            "FOO=bar env",
+            "ls ~",
+            "echo a\necho b",
+            "definitely-not-a-real-program-xyz",
+            "",
+        ],
+    )
+    def test_shell_needed(self, command: str) -> None:
+        assert direct_argv(command) is None
+
+
 class TestExecutor:
     @pytest.fixture
     def executor(self) -> Executor:
         return Executor(shell="/bin/sh")
 
+    def test_runs_script_without_shebang(
+        self, executor: Executor, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        script = tmp_path / "run.sh"
+        script.write_text("echo from script\n")
+        script.chmod(0o755)
+        monkeypatch.chdir(tmp_path)
+        result = executor.run("./run.sh")
+        assert result.returncode == 0
+        assert result.stdout == "from script\n"
+
+    def test_configured_shell_runs_simple_commands(self) -> None:
+        executor = Executor(shell="/bin/bash", stream_output=False)
+        with patch("writ.executor.direct_argv") as mock_direct:
+            result = executor.run("echo hello")
+        mock_direct.assert_not_called()
+        assert result.stdout == "hello\n"
+
     def test_executes_simple_command(self, executor: Executor) -> None:
         result = executor.run("echo hello")
         assert isinstance(result, ExecutionResult)
@@ -36,6 +86,19 @@ class TestExecutor:
         result = executor.run("echo $MY_VAR", env={"MY_VAR": "injected"})
         assert result.stdout.strip() == "injected"
 
+    def test_build_env_inherits_when_nothing_to_add(self, executor: Executor) -> None:
+        assert executor.build_env() is None
+
+    def test_build_env_layers_secrets_then_overrides(self) -> None:
+        secrets = SecretStore()
+        secrets.add("TOKEN", "secret")
+        secrets.add("MODE", "from_secret")
+        executor = Executor(shell="/bin/sh", secrets=secrets)
+        with patch.dict("os.environ", {"BASE": "1"}):
+            env = executor.build_env({"MODE": "override"})
+        assert env is not None
+        assert (env["BASE"], env["TOKEN"], env["MODE"]) == ("1", "secret", "override")
+
     def test_masks_secrets_in_captured_output(self) -> None:
         secrets = SecretStore()
         secrets.add("TOKEN", "supersecret")
@@ -48,6 +111,44 @@ class TestExecutor:
         result = executor.run("sleep 10", timeout=1)
         assert result.returncode != 0
 
+    def test_timeout_not_triggered_by_background_child(self, executor: Executor) -> None:
+        with patch("writ.executor.DRAIN_TIMEOUT", 2.0):
+            result = executor.run("echo hi; sleep 4 &", timeout=1)
+        assert result.returncode == 0
+        assert result.stdout == "hi\n"
+
+    def test_timeout_applies_after_pipes_close(self, executor: Executor) -> None:
+        start = time.monotonic()
+        result = executor.run("exec >&- 2>&-; sleep 4", timeout=1)
+        assert time.monotonic() - start < 3
+        assert result.returncode == -9
+
     def test_stores_original_command(self, executor: Executor) -> None:
         result = executor.run("echo test")
         assert result.command == "echo test"
+
+    def test_streams_masked_stdout_only(self, capsys: pytest.CaptureFixture[str]) -> None:
+        secrets = SecretStore()
+        secrets.add("TOKEN", "supersecret")
+        executor = Executor(shell="/bin/sh", secrets=secrets, stream_output=True)
+        executor.run("echo one supersecret; printf two; echo err >&2")
+        assert capsys.readouterr().out == "one ***\ntwo"
+
+    def test_masks_secret_split_across_reads(self) -> None:
+        secrets = SecretStore()
+        secrets.add("TOKEN", "supersecret")
+        executor = Executor(shell="/bin/sh", secrets=secrets, stream_output=False)
+        result = executor.run("printf super; sleep 0.2; printf 'secret\\n'")
+        assert result.stdout == "***\n"
+
+    def test_replaces_invalid_utf8(self, executor: Executor) -> None:
+        result = executor.run("printf 'ok \\377\\n'")
+        assert result.stdout == "ok \ufffd\n"
+
+    def test_does_not_wait_on_background_child_pipes(self, executor: Executor) -> None:
+        with patch("writ.executor.DRAIN_TIMEOUT", 0.2):
+            start = time.monotonic()
+            result = executor.run("echo done; sleep 5 &")
+        assert time.monotonic() - start < 3
+        assert result.returncode == 0
+        assert result.stdout == "done\n"
@@ -0,0 +1,113 @@
+"""Tests for fork log helpers."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from writ._logutil import (
+    LOG_HEADER_PREFIXES,
+    LOG_TRAILER_PREFIXES,
+    LogStream,
+    read_meta,
+    scan_fields,
+    tail_offset,
+)
+
+
+class TestScanLogFields:
+    def test_first_match_wins_and_stops_early(self) -> None:
+        fields: dict[str, str] = {}
+        chunk = b"--- FORK: a ---\nStarted: 1\nStarted: 2\n--- FORK: b ---\n"
+        scan_fields(chunk, LOG_HEADER_PREFIXES, fields)
+        assert fields == {"name": "a ---", "started": "1"}
+
+    def test_skips_fields_already_found(self) -> None:
+        fields = {"exit": "0"}
+        scan_fields(b"Exit code: 1\n", LOG_TRAILER_PREFIXES, fields)
+        assert fields == {"exit": "0"}
+
+
+class TestLogStream:
+    def test_detects_trailer_split_across_chunks(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        content = "--- FORK: x ---\n---\nout \u2713\n\n---\nExit code: 0\n---\n"
+        log = tmp_path / "x.log"
+        log.write_text(content)
+        with open(log, "rb", buffering=0) as f:
+            stream = LogStream(f, chunk_size=7)
+            assert stream.drain() is True
+        assert stream.finished is True
+        assert capsys.readouterr().out == content
+
+    def test_running_log_is_not_finished(self, tmp_path: Path) -> None:
+        log = tmp_path / "x.log"
+        log.write_text("--- FORK: x ---\n---\nresult\nExit code: is just output\n")
+        with open(log, "rb", buffering=0) as f:
+            stream = LogStream(f, chunk_size=7)
+            stream.drain()
+            assert stream.finished is False
+            assert stream.drain() is False
+
+
+class TestReadMeta:
+    def test_reads_header_and_trailer(self, tmp_path: Path) -> None:
+        log = tmp_path / "x.log"
+        log.write_text(
+            "--- FORK: deploy ---\nStarted: 2026-01-01T00:00:00\n---\n"
+            + "output\n" * 5000
+            + "\n---\nFinished: 2026-01-01T00:01:00\nExit code: 3\n---\n"
+        )
+        assert read_meta(str(log)) == ("deploy", "2026-01-01T00:00:00", "exit 3")
+
+    def test_running_log(self, tmp_path: Path) -> None:
+        log = tmp_path / "x.log"
+        log.write_text("--- FORK: deploy ---\n---\nstill going\n")
+        assert read_meta(str(log)) == ("deploy", "?", "running")
+
+    def test_trailer_wins_over_exit_code_in_output(self, tmp_path: Path) -> None:
+        log = tmp_path / "x.log"
+        log.write_text(
+            "--- FORK: deploy ---\n---\n"
+            + "output\n" * 1000
+            + "Exit code: 3\n\n---\nFinished: 2026-01-01T00:01:00\nExit code: 0\n---\n"
+        )
+        assert read_meta(str(log))[2] == "exit 0"
+
+    def test_small_log_trailer_from_head(self, tmp_path: Path) -> None:
+        log = tmp_path / "x.log"
+        log.write_text(
+            "--- FORK: build ---\nStarted: 2026-01-01T00:00:00\n---\nExit code: 9\n"
+            + "x\n" * 300
+            + "\n---\nExit code: 0\n---\n"
+        )
+        assert read_meta(str(log)) == ("build", "2026-01-01T00:00:00", "exit 0")
+
+
+class TestTailOffset:
+    def _offset(self, path: Path, lines: int, block: int = 8192) -> int:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            return tail_offset(fd, lines, block)
+        finally:
+            os.close(fd)
+
+    @pytest.mark.parametrize("block", [1, 3, 8192])
+    def test_finds_start_of_last_lines(self, tmp_path: Path, block: int) -> None:
+        log = tmp_path / "x.log"
+        log.write_bytes(b"one\ntwo\nthree\nfour\n")
+        offset = self._offset(log, 2, block)
+        assert log.read_bytes()[offset:] == b"three\nfour\n"
+
+    def test_counts_unterminated_last_line(self, tmp_path: Path) -> None:
+        log = tmp_path / "x.log"
+        log.write_bytes(b"one\ntwo\nthree")
+        assert log.read_bytes()[self._offset(log, 2) :] == b"two\nthree"
+
+    def test_short_file_starts_at_zero(self, tmp_path: Path) -> None:
+        log = tmp_path / "x.log"
+        log.write_bytes(b"one\ntwo\n")
+        assert self._offset(log, 10) == 0
+        log.write_bytes(b"")
+        assert self._offset(log, 10) == 0
@@ -1,5 +1,7 @@
 """Tests for the entry point."""
 
+import subprocess
+import sys
 from pathlib import Path
 from unittest.mock import patch
 
@@ -65,18 +67,40 @@ class TestMainInit:
     def test_init_calls_run_init(self) -> None:
         with (
             patch("sys.argv", ["writ", "init"]),
-            patch("writ.__main__.run_init") as mock_init,
+            patch("writ.cli.run_init") as mock_init,
         ):
             result = main()
         mock_init.assert_called_once()
         assert result == 0
 
+    def test_init_skips_parser(self) -> None:
+        with (
+            patch("sys.argv", ["writ", "init"]),
+            patch("writ.cli.run_init"),
+            patch("writ.__main__._build_parser") as mock_parser,
+        ):
+            main()
+        mock_parser.assert_not_called()
+
+
+class TestMainRepl:
+    def test_no_args_starts_repl_without_parser(self) -> None:
+        with (
+            patch("sys.argv", ["writ"]),
+            patch("writ.__main__._run_repl", return_value=0) as mock_repl,
+            patch("writ.__main__._build_parser") as mock_parser,
+        ):
+            result = main()
+        mock_repl.assert_called_once()
+        mock_parser.assert_not_called()
+        assert result == 0
+
 
 class TestMainConfig:
     def test_config_calls_run_config(self) -> None:
         with (
             patch("sys.argv", ["writ", "config", "--editor", "nano"]),
-            patch("writ.__main__.run_config") as mock_config,
+            patch("writ.cli.run_config") as mock_config,
             patch("writ.__main__._load_repl_settings", return_value=ReplSettings()),
         ):
             result = main()
@@ -87,7 +111,7 @@ class TestMainConfig:
         settings = ReplSettings(editor="emacs")
         with (
             patch("sys.argv", ["writ", "config"]),
-            patch("writ.__main__.run_config") as mock_config,
+            patch("writ.cli.run_config") as mock_config,
             patch("writ.__main__._load_repl_settings", return_value=settings),
         ):
             result = main()
@@ -104,7 +128,7 @@ class TestLoadReplSettings:
         home_dir.mkdir()
         (home_dir / "settings.yaml").write_text(settings_content)
 
-        with patch("writ.__main__.WRIT_HOME", home_dir):
+        with patch("writ.__main__.WRIT_HOME_EXPANDED", home_dir):
             settings = _load_repl_settings()
         assert settings.mode == "strict"
         assert settings.editor == "nano"
@@ -113,7 +137,13 @@ class TestLoadReplSettings:
         empty_home = tmp_path / "empty-home"
         empty_home.mkdir()
         # No settings.yaml in home dir or local ./config/
-        with patch("writ.__main__.WRIT_HOME", empty_home):
+        with patch("writ.__main__.WRIT_HOME_EXPANDED", empty_home):
             settings = _load_repl_settings()
         assert settings.editor == "vim"
         assert settings.mode == "open"
+
+
+def test_import_does_not_load_prompt_toolkit() -> None:
+    code = "import sys, writ.__main__; print('prompt_toolkit' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.stdout.strip() == "False"
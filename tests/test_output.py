@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from writ.output import ExecutionResult, OutputBuffer
+from writ.output import ExecutionResult, LazyExecutionResult, OutputBuffer
 
 
 class TestExecutionResult:
@@ -26,6 +26,28 @@ class TestExecutionResult:
         assert result.succeeded is False
 
 
+class TestLazyExecutionResult:
+    def test_masks_output_only_when_read(self) -> None:
+        calls: list[str] = []
+
+        def mask(text: str) -> str:
+            calls.append(text)
+            return text.replace("hunter2", "***")
+
+        result = LazyExecutionResult("cmd", 0, b"pw hunter2\n", b"\xff", 0.1, mask)
+        assert result.succeeded
+        assert calls == []
+        assert result.stdout == "pw ***\n"
+        assert result.stdout == "pw ***\n"
+        assert result.stderr == "\ufffd"
+        assert calls == ["pw hunter2\n", "\ufffd"]
+
+    def test_has_no_instance_dict(self) -> None:
+        result = LazyExecutionResult("cmd", 0, b"out", b"", 0.1, str)
+        assert result.stdout == "out"
+        assert not hasattr(result, "__dict__")
+
+
 class TestOutputBuffer:
     def test_stores_results(self) -> None:
         buf = OutputBuffer(max_size=5)
@@ -65,3 +87,30 @@ class TestOutputBuffer:
         buf = OutputBuffer(max_size=5)
         buf.add(ExecutionResult("cmd", 0, "out", "", 0.1))
         assert buf.last(99) is None
+
+    def test_large_output_round_trips_through_compression(self) -> None:
+        buf = OutputBuffer(max_size=5)
+        big = "line of build output\n" * 10_000
+        result = ExecutionResult("build", 1, big, "warning\n", 2.5)
+        buf.add(result)
+        restored = buf.last()
+        assert restored == result
+        assert restored is not result
+        assert restored is not None and restored.timestamp == result.timestamp
+
+    def test_large_lazy_output_stays_unread_when_buffered(self) -> None:
+        calls: list[str] = []
+
+        def mask(text: str) -> str:
+            calls.append(text)
+            return text.replace("hunter2", "***")
+
+        raw = b"pw hunter2\n" * 10_000
+        buf = OutputBuffer(max_size=5)
+        buf.add(LazyExecutionResult("build", 0, raw, b"", 2.5, mask))
+        assert calls == []
+        restored = buf.last()
+        assert restored is not None
+        assert calls == []
+        assert restored.stdout == "pw ***\n" * 10_000
+        assert restored.stderr == ""
@@ -17,6 +17,16 @@ from writ.pipeline import (
 from writ.variables import VariableResolver
 
 
+def _read_finished_log(log_path: Path, timeout: float = 5.0) -> str:
+    """Poll a fork log until its trailer has been written, then return it."""
+    deadline = time.monotonic() + timeout
+    content = log_path.read_text()
+    while "Duration:" not in content and time.monotonic() < deadline:
+        time.sleep(0.01)
+        content = log_path.read_text()
+    return content
+
+
 @pytest.fixture
 def executor() -> Executor:
     return Executor(shell="/bin/sh", stream_output=False)
@@ -52,6 +62,55 @@ class TestPipelineLoader:
         types = {p.name: p.pipeline_type for p in pipelines}
         assert "sample_workflow" in types
 
+    def test_get_by_name(self, fixtures_dir: Path) -> None:
+        loader = PipelineLoader(fixtures_dir)
+        match = loader.get("simple_pipeline")
+        assert match is not None
+        assert match.pipeline_type == "yaml"
+        assert loader.get("nonexistent") is None
+
+    def test_get_prefers_first_file_for_shared_name(self, fixtures_dir: Path) -> None:
+        loader = PipelineLoader(fixtures_dir)
+        match = loader.get("sample_workflow")
+        assert match is not None
+        assert match.pipeline_type == "python"
+
+    def test_discover_skips_ineligible_entries(self, tmp_path: Path) -> None:
+        (tmp_path / "dir.yaml").mkdir()
+        (tmp_path / ".hidden.sh").write_text("echo hi\n")
+        (tmp_path / "__init__.py").write_text("")
+        (tmp_path / "notes.txt").write_text("x")
+        (tmp_path / "Makefile").write_text("x")
+        (tmp_path / "b.sh").write_text("echo b\n")
+        (tmp_path / "a.py").write_text("")
+        names = [p.name for p in PipelineLoader(tmp_path).discover()]
+        assert names == ["a", "b"]
+
+    def test_discover_reads_metadata_for_many_yaml_files(self, tmp_path: Path) -> None:
+        for i in range(12):
+            (tmp_path / f"wf{i:02d}.yaml").write_text(f"name: Workflow {i}\ndescription: d{i}\n")
+        (tmp_path / "broken.yaml").write_text("name: [unclosed\n")
+        pipelines = PipelineLoader(tmp_path).discover()
+        assert [p.name for p in pipelines] == ["broken", *(f"wf{i:02d}" for i in range(12))]
+        assert pipelines[0].title == "broken"
+        assert [p.title for p in pipelines[1:]] == [f"Workflow {i}" for i in range(12)]
+
+    def test_discover_reads_only_header(self, tmp_path: Path) -> None:
+        body = "".join(f"  - name: s{i}\n    run: echo {i}\n" for i in range(40))
+        (tmp_path / "big.yaml").write_text(
+            f"name: Big\ndescription: Lots of steps\nsteps:\n{body}  - [unclosed\n"
+        )
+        info = PipelineLoader(tmp_path).discover()[0]
+        assert (info.title, info.description) == ("Big", "Lots of steps")
+
+    def test_discover_falls_back_to_full_parse(self, tmp_path: Path) -> None:
+        body = "".join(f"  - name: s{i}\n    run: echo {i}\n" for i in range(40))
+        (tmp_path / "late.yaml").write_text(
+            f"steps:\n{body}name: Late\ndescription: Keys after steps\n"
+        )
+        info = PipelineLoader(tmp_path).discover()[0]
+        assert (info.title, info.description) == ("Late", "Keys after steps")
+
     def test_load_yaml_pipeline(self, fixtures_dir: Path) -> None:
         loader = PipelineLoader(fixtures_dir)
         pipeline = loader.load_yaml(fixtures_dir / "simple_pipeline.yaml")
@@ -59,6 +118,13 @@ class TestPipelineLoader:
         assert pipeline.title == "Simple Pipeline"
         assert len(pipeline.steps) == 2
 
+    def test_loaded_pipeline_uses_slots(self, fixtures_dir: Path) -> None:
+        loader = PipelineLoader(fixtures_dir)
+        pipeline = loader.load_yaml(fixtures_dir / "simple_pipeline.yaml")
+        assert not hasattr(pipeline, "__dict__")
+        assert not hasattr(pipeline.steps[0], "__dict__")
+        assert not hasattr(loader.discover()[0], "__dict__")
+
 
 class TestYamlPipelineExecution:
     def test_runs_simple_pipeline(self, executor: Executor, resolver: VariableResolver) -> None:
@@ -152,6 +218,60 @@ class TestYamlPipelineExecution:
         assert len(results) == 1
         assert results[0].skipped is True
 
+    def test_evaluates_variable_and_named_step_conditions(
+        self, executor: Executor, resolver: VariableResolver
+    ) -> None:
+        runner = PipelineRunner(executor=executor, resolver=resolver)
+        pipeline = YamlPipeline(
+            title="Test",
+            description="test",
+            variables={"target": "staging"},
+            steps=[
+                PipelineStep(name="build", run="exit 1", on_failure="continue"),
+                PipelineStep(name="ok", run="echo ok", on_failure="abort"),
+                PipelineStep(
+                    name="notify",
+                    run="echo notify",
+                    when=[{"target": "staging"}, {"step.build": "failed"}],
+                ),
+                PipelineStep(name="undefined", run="echo x", when=[{"missing_var": ""}]),
+                PipelineStep(name="unknown", run="echo x", when=[{"step.nope": "succeeded"}]),
+            ],
+        )
+        results = runner.run_yaml(pipeline)
+        assert [r.skipped for r in results] == [False, False, False, True, True]
+
+    def test_named_step_condition_uses_first_matching_step(
+        self, executor: Executor, resolver: VariableResolver
+    ) -> None:
+        runner = PipelineRunner(executor=executor, resolver=resolver)
+        pipeline = YamlPipeline(
+            title="Test",
+            description="test",
+            variables={},
+            steps=[
+                PipelineStep(name="build", run="exit 1", on_failure="continue"),
+                PipelineStep(name="build", run="echo retry"),
+                PipelineStep(name="report", run="echo report", when=[{"step.build": "failed"}]),
+            ],
+        )
+        results = runner.run_yaml(pipeline)
+        assert results[2].skipped is False
+
+    def test_pipeline_variables_do_not_outlive_the_run(self, executor: Executor) -> None:
+        resolver = VariableResolver(config_vars={"target": "dev"})
+        runner = PipelineRunner(executor=executor, resolver=resolver)
+        pipeline = YamlPipeline(
+            title="Test",
+            description="test",
+            variables={"target": "staging"},
+            steps=[PipelineStep(name="s1", run="echo ${target}")],
+        )
+        results = runner.run_yaml(pipeline)
+        assert results[0].execution_result is not None
+        assert results[0].execution_result.stdout.strip() == "staging"
+        assert resolver.resolve("${target}") == "dev"
+
     def test_resolves_variables_in_run(
         self, executor: Executor, resolver: VariableResolver
     ) -> None:
@@ -220,8 +340,7 @@ class TestForkShell:
         runner = PipelineRunner(executor=executor, resolver=resolver)
         fork_id, log_path = runner.fork_shell(script, log_dir)
 
-        # Give the process a moment to start
-        time.sleep(0.1)
+        # The header is flushed before fork_shell returns
         content = log_path.read_text()
         assert "--- FORK:" in content
         assert "Started:" in content
@@ -240,14 +359,27 @@ class TestForkShell:
         runner = PipelineRunner(executor=executor, resolver=resolver)
         fork_id, log_path = runner.fork_shell(script, log_dir)
 
-        # Wait for process to finish and trailer to be written
-        time.sleep(1.0)
-        content = log_path.read_text()
+        content = _read_finished_log(log_path)
         assert "hello from fork" in content
         assert "Finished:" in content
         assert "Exit code: 0" in content
         assert "Duration:" in content
 
+    def test_fork_header_precedes_script_output(
+        self, tmp_path: Path, executor: Executor, resolver: VariableResolver
+    ) -> None:
+        log_dir = tmp_path / "logs"
+        log_dir.mkdir()
+        script = tmp_path / "test.sh"
+        script.write_text("#!/bin/sh\necho first line of output\n")
+        script.chmod(0o755)
+
+        runner = PipelineRunner(executor=executor, resolver=resolver)
+        _, log_path = runner.fork_shell(script, log_dir)
+
+        content = _read_finished_log(log_path)
+        assert content.index("Script:") < content.index("first line of output")
+
     def test_fork_captures_nonzero_exit(
         self, tmp_path: Path, executor: Executor, resolver: VariableResolver
     ) -> None:
@@ -260,6 +392,5 @@ class TestForkShell:
         runner = PipelineRunner(executor=executor, resolver=resolver)
         fork_id, log_path = runner.fork_shell(script, log_dir)
 
-        time.sleep(1.0)
-        content = log_path.read_text()
+        content = _read_finished_log(log_path)
         assert "Exit code: 42" in content
@@ -51,11 +51,71 @@ class TestVariableResolver:
         result = resolver.resolve("plain text")
         assert result == "plain text"
 
+    def test_plain_text_skips_scope_build(self) -> None:
+        resolver = VariableResolver(config_vars={})
+        with patch.object(resolver, "_scope") as scope:
+            assert resolver.resolve("echo hi") == "echo hi"
+        scope.assert_not_called()
+
+    def test_lookup_follows_resolution_order(self) -> None:
+        secrets = SecretStore()
+        secrets.add("S", "secret")
+        resolver = VariableResolver(
+            config_vars={"env": "staging", "c": "config"},
+            pipeline_vars={"env": "production"},
+            secrets=secrets,
+        )
+        assert resolver.lookup("env") == "production"
+        assert resolver.lookup("c") == "config"
+        assert resolver.lookup("S") == "secret"
+        with patch.dict("os.environ", {"E": "from_env"}):
+            assert resolver.lookup("E") == "from_env"
+        assert resolver.lookup("MISSING_VAR") is None
+
+    def test_repeat_resolution_is_memoized(self) -> None:
+        resolver = VariableResolver(config_vars={"writ_memo_project": "myapp"})
+        assert resolver.resolve("echo ${writ_memo_project}") == "echo myapp"
+        # An empty scope would make a fresh scan raise; the memo must answer instead
+        with patch.object(resolver, "_scope", return_value={}):
+            assert resolver.resolve("echo ${writ_memo_project}") == "echo myapp"
+
+    def test_memo_invalidated_when_secrets_change(self) -> None:
+        secrets = SecretStore()
+        secrets.add("TOKEN", "old")
+        resolver = VariableResolver(config_vars={}, secrets=secrets)
+        assert resolver.resolve("t=${TOKEN}") == "t=old"
+        secrets.add("TOKEN", "new")
+        assert resolver.resolve("t=${TOKEN}") == "t=new"
+
+    def test_env_values_are_not_memoized(self) -> None:
+        resolver = VariableResolver(config_vars={})
+        with patch.dict("os.environ", {"MY_VAR": "one"}):
+            assert resolver.resolve("${MY_VAR}") == "one"
+        with patch.dict("os.environ", {"MY_VAR": "two"}):
+            assert resolver.resolve("${MY_VAR}") == "two"
+
+    def test_push_pipeline_vars_scopes_overrides(self) -> None:
+        resolver = VariableResolver(config_vars={"env": "staging"})
+        assert resolver.resolve("${env}") == "staging"
+        with resolver.push_pipeline_vars({"env": "production"}):
+            assert resolver.resolve("${env}") == "production"
+        assert resolver.resolve("${env}") == "staging"
+
+    def test_push_pipeline_vars_restores_after_error(self) -> None:
+        resolver = VariableResolver(config_vars={}, pipeline_vars={"a": "1"})
+        with pytest.raises(RuntimeError), resolver.push_pipeline_vars({"a": "2"}):
+            raise RuntimeError
+        assert resolver.lookup("a") == "1"
+
     def test_literal_dollar_brace_escaped(self) -> None:
         resolver = VariableResolver(config_vars={})
         result = resolver.resolve("cost is $100")
         assert result == "cost is $100"
 
+    def test_empty_and_unterminated_references_stay_literal(self) -> None:
+        resolver = VariableResolver(config_vars={"a": "1"})
+        assert resolver.resolve("${}${a}$${a} ${a") == "${}1$1 ${a"
+
 
 class TestSecretStore:
     def test_add_and_retrieve_secret(self) -> None:
@@ -80,6 +140,33 @@ class TestSecretStore:
         result = store.mask("alpha and beta")
         assert result == "*** and ***"
 
+    def test_mask_prefers_longest_overlapping_secret(self) -> None:
+        store = SecretStore()
+        store.add("SHORT", "pass")
+        store.add("LONG", "password")
+        assert store.mask("pw=password") == "pw=***"
+
+    def test_mask_does_not_rescan_replacements(self) -> None:
+        store = SecretStore()
+        store.add("A", "s3cr3t")
+        store.add("B", "**")
+        assert store.mask("s3cr3t") == "***"
+
+    def test_mask_treats_values_literally(self) -> None:
+        store = SecretStore()
+        store.add("RE", "a.b*")
+        assert store.mask("axb a.b*") == "axb ***"
+
+    def test_mask_sees_secrets_added_later(self, tmp_path: Path) -> None:
+        store = SecretStore()
+        assert store.mask("alpha beta") == "alpha beta"
+        store.add("A", "alpha")
+        assert store.mask("alpha beta") == "*** beta"
+        env_file = tmp_path / ".env"
+        env_file.write_text("B=beta\n")
+        store.load_dotenv(env_file)
+        assert store.mask("alpha beta") == "*** ***"
+
     def test_load_from_dotenv(self, tmp_path: Path) -> None:
         env_file = tmp_path / ".env"
         env_file.write_text("SECRET_KEY=mykey123\nDB_URL=postgres://localhost\n")
@@ -88,6 +175,28 @@ class TestSecretStore:
         assert store.get("SECRET_KEY") == "mykey123"
         assert store.get("DB_URL") == "postgres://localhost"
 
+    def test_load_dotenv_skips_comments_and_blank_lines(self, tmp_path: Path) -> None:
+        env_file = tmp_path / ".env"
+        env_file.write_bytes(
+            b"# comment=ignored\n\n  SPACED  =  padded value  \r\n"
+            b"EMPTY=\nNEXT=after_empty\nURL=a=b\nnot a pair\n  # indented=comment\n"
+        )
+        store = SecretStore()
+        store.load_dotenv(env_file)
+        assert store.as_env_dict() == {
+            "SPACED": "padded value",
+            "EMPTY": "",
+            "NEXT": "after_empty",
+            "URL": "a=b",
+        }
+
+    def test_load_dotenv_skips_lines_without_key(self, tmp_path: Path) -> None:
+        env_file = tmp_path / ".env"
+        env_file.write_text("=orphan\n  =also\r\nKEY=v\n")
+        store = SecretStore()
+        store.load_dotenv(env_file)
+        assert store.as_env_dict() == {"KEY": "v"}
+
     def test_load_dotenv_missing_file_is_noop(self, tmp_path: Path) -> None:
         store = SecretStore()
         store.load_dotenv(tmp_path / "nonexistent.env")
@@ -0,0 +1,44 @@
+"""Tests for the file watcher."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from writ.watcher import FileWatcher
+
+
+class TestFileWatcher:
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+    def test_uses_inotify_on_linux(self, tmp_path: Path) -> None:
+        log = tmp_path / "out.log"
+        log.write_text("")
+        with FileWatcher(str(log)) as watcher:
+            assert watcher.uses_inotify is True
+
+    def test_wait_returns_after_append(self, tmp_path: Path) -> None:
+        log = tmp_path / "out.log"
+        log.write_text("")
+        with FileWatcher(str(log)) as watcher:
+            timer = threading.Timer(0.05, lambda: log.write_text("line\n"))
+            timer.start()
+            start = time.monotonic()
+            watcher.wait(timeout=5.0)
+            timer.join()
+        assert time.monotonic() - start < 2.0
+
+    def test_wait_times_out_without_changes(self, tmp_path: Path) -> None:
+        log = tmp_path / "out.log"
+        log.write_text("")
+        with FileWatcher(str(log)) as watcher:
+            start = time.monotonic()
+            watcher.wait(timeout=0.05)
+        assert time.monotonic() - start < 1.0
+
+    def test_missing_file_falls_back_to_polling(self, tmp_path: Path) -> None:
+        watcher = FileWatcher(str(tmp_path / "missing.log"), poll_interval=0.01)
+        assert watcher.uses_inotify is False
+        watcher.wait()
+        watcher.close()
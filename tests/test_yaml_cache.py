@@ -0,0 +1,74 @@
+"""Tests for the parsed-YAML cache."""
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from writ import _yaml_cache
+from writ._yaml_cache import clear_cache, load_cached, parse_yaml
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache() -> Iterator[None]:
+    clear_cache()
+    yield
+    clear_cache()
+
+
+class TestParseYaml:
+    def test_parses_bytes(self) -> None:
+        assert parse_yaml(b"a: 1\nb: [x, y]\n") == {"a": 1, "b": ["x", "y"]}
+
+    def test_rejects_python_tags(self) -> None:
+        with pytest.raises(yaml.YAMLError):
+            parse_yaml("!!python/object/apply:os.system ['true']")
+
+
+class TestLoadCached:
+    def test_unchanged_file_is_parsed_once(self, tmp_path: Path) -> None:
+        path = tmp_path / "a.yaml"
+        path.write_text("a: 1\n")
+        with patch("writ._yaml_cache.parse_yaml", wraps=parse_yaml) as spy:
+            assert load_cached(path) == {"a": 1}
+            assert load_cached(path) == {"a": 1}
+        assert spy.call_count == 1
+
+    def test_changed_file_is_reparsed(self, tmp_path: Path) -> None:
+        path = tmp_path / "a.yaml"
+        path.write_text("a: 1\n")
+        load_cached(path)
+        path.write_text("a: 22\n")
+        assert load_cached(path) == {"a": 22}
+
+    def test_same_size_rewrite_detected_by_mtime(self, tmp_path: Path) -> None:
+        path = tmp_path / "a.yaml"
+        path.write_text("a: 1\n")
+        load_cached(path)
+        path.write_text("a: 2\n")
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert load_cached(path) == {"a": 2}
+
+    def test_returns_independent_copies(self, tmp_path: Path) -> None:
+        path = tmp_path / "a.yaml"
+        path.write_text("items: [1, 2]\n")
+        first = load_cached(path)
+        first["items"].append(3)
+        assert load_cached(path) == {"items": [1, 2]}
+
+    def test_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        paths = [tmp_path / f"{i}.yaml" for i in range(3)]
+        for p in paths:
+            p.write_text("a: 1\n")
+        with patch.object(_yaml_cache, "MAX_ENTRIES", 2):
+            for p in paths:
+                load_cached(p)
+        assert list(_yaml_cache._CACHE) == paths[1:]
+
+    def test_missing_file_raises(self, tmp_path: Path) -> None:
+        with pytest.raises(FileNotFoundError):
+            load_cached(tmp_path / "missing.yaml")